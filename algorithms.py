@@ -2,563 +2,457 @@ import pygame
 import time
 
 # import necessary project files
-import colours
+import engine
 from cell import Cell
+from grid import Grid, State
 
 pygame.init()
 
 
-class Dijkstra:
+class _VisualSearch:
     """
-    This class provides functionality for running Dijkstra's algorithm on a grid to find
-    the shortest path from a start cell to a finish cell.
-    
+    The base class for the pygame versions of the algorithms.
+
+    The search itself is run by the headless engine (engine.py) on the same grid. Once started, the page calls
+    update() once per frame from the main loop, which pulls a frame's worth of steps from the engine and updates
+    the cells' states so the page can draw them.
+
     Attributes:
-    
+
         surface (pygame.Surface): The surface on which the grid is displayed.
         page: The current page of the program.
-        grid (list): the grid on which the algorithm is to be run.
-        
+        grid (Grid): the grid on which the algorithm is to be run.
+
     Methods:
-    
-        check_neighbours(self, cell: Cell) -> None:
-            Checks if the cell has any neighbours
-        run(self, start_cell: Cell, finish_cell: Cell) -> str
-            Runs Dijkstra's algorithm to find the shortest path.
+
+        set_speed(self, steps_per_frame: int=1, target_fps: int=None, instant: bool=False) -> None:
+            Sets how many steps of the search are taken each frame
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts the algorithm.
             Args:
                 start_cell (Cell): The starting cell of the path.
                 finish_cell (Cell): The ending cell of the path.
             Returns:
-                str: A message indicating whether the path was found and its length and time taken.
-            Raises:
-                ValueError: If the start_cell or finish_cell is not placed on the grid.
-    
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
     """
-    
-    def __init__(self, surface: pygame.Surface, page, grid: list) -> None:
+
+    search_class = engine.Search
+    label = "Search"  # the name shown on the visualisation page's algorithm button
+
+    # the state given to a cell for each type of event sent by the engine
+    event_states = {
+        'queued': State.QUEUED,
+        'visited': State.VISITED,
+        'path': State.PATH
+    }
+
+    def __init__(self, surface: pygame.Surface, page, grid: Grid) -> None:
 
         # initialise all attributes necessary to load the display
         self.surface = surface
         self.page = page
-        
+
         # initialise attributes used in the pathfinding algorithm
         self.grid = grid
-        self.open = []
+        self.search = None
+        self.steps = None
+        self.start_cell = None
+        self.finish_cell = None
         self.is_found = False
 
         # initialise useful data to help with analysis
         self.path_length = 0
         self.nodes_searched = 0
+        self.elapsed_time = 0
 
-    def check_neighbours(self, cell: Cell) -> None:
-        """ Checks if the cell has any neighbours that have not been visited yet """
-        
-        # loops through all of the current cell's neighbours
-        for neighbour in cell.neighbours:
-            
-            # checks if the neighbour's colour is blank or finished
-            if neighbour.colour == colours.BLANK_COLOUR or neighbour.colour == colours.FINISH_COLOUR:
-
-                # add the neighbour to the open set, set it to queued, and set its prior cell to the current cell
-                self.open.append(neighbour)
-                neighbour.colour = colours.QUEUED_COLOUR
-                neighbour.prior_cell = cell
-
-    def run(self, start_cell: Cell, finish_cell: Cell) -> str:
-        
-        if start_cell and finish_cell:
-            
-            # reset any visited/queued cells to blank
-            for row in self.grid:
-                for node in row:
-                    if node.colour == colours.VISITED_COLOUR or node.colour == colours.QUEUED_COLOUR:
-                        node.colour = colours.BLANK_COLOUR
-            
-            # initialise variables
-            self.path_length = 0
-            self.nodes_searched = 1
-
-            self.open = [start_cell]
-            self.is_found = False
-            self.page.is_running = True
-
-            self.start_time = time.time()
-
-            # reset any path cells from previous algorithms
-            for row in self.grid:
-                for node in row:
-                    if node.colour == colours.PATH_COLOUR:
-                        node.colour = colours.BLANK_COLOUR
-
-            # ensures that the loop only runs if there are still nodes to explore
-            while self.open and self.page.is_running:
-                
-                self.nodes_searched += 1
-                
-                # check if the user wants to quit the program
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        quit()
-
-                # sets the current cell to the first unvisited cell in the open list and checks if it is the finish cell
-                curr_cell = self.open[0]
-                if curr_cell == finish_cell:
-                    self.is_found = True
-                    self.elapsed_time = round(time.time() - self.start_time, 3)
-                    return self.backtrack(start_cell, finish_cell)
-
-                self.check_neighbours(curr_cell)
-
-                # set newly visited cells to visited and ensure that the start cell has the correct colour
-                curr_cell.colour = colours.VISITED_COLOUR
-                start_cell.colour = colours.START_COLOUR
-
-                # remove the current cell from the open list and load the screen (visualisation page)
-                self.open.pop(0)
-                self.page.load()
-                pygame.display.update()
-            
-            self.page.is_running = False
-            return "path not found"
-                
-        else:
+        # initialise attributes controlling how many steps are taken each frame
+        self.steps_per_frame = 1
+        self.target_fps = None
+        self.instant = False
+
+    def set_speed(self, steps_per_frame: int=1, target_fps: int=None, instant: bool=False) -> None:
+        """
+        Sets how many steps of the search are taken each frame.
+
+        Args:
+            steps_per_frame (int): The number of steps (searched nodes/path cells) taken each frame.
+            target_fps (int): If given, each frame takes as many steps as fit in 1/target_fps seconds instead.
+            instant (bool): If True, the whole search is run as soon as it is started and only the path is shown.
+        """
+
+        self.steps_per_frame = steps_per_frame
+        self.target_fps = target_fps
+        self.instant = instant
+
+    def clear_search(self) -> None:
+        """ Resets any visited/queued cells to blank """
+
+        self.grid.clear_search((State.VISITED, State.QUEUED))
+
+    def apply(self, event: str, node: int) -> None:
+        """ Updates the grid for a step of the search """
+
+        if event == 'found':
+            self.clear_search()
+
+        # update the cell's state (the start and finish cells keep their own states, and a barrier drawn onto the
+        # cell while the search was running stays a barrier)
+        elif node != self.start_cell.index and node != self.finish_cell.index and self.grid.state[node] < State.BARRIER:
+            self.grid.paint(node, self.event_states[event])
+
+    def start(self, start_cell: Cell, finish_cell: Cell) -> str:
+
+        if not (start_cell and finish_cell):
             return "start/finish cell not placed"
-                
-    def backtrack(self, start_cell: Cell, finish_cell: Cell) -> str:
-        
-        # reset any visited/queued cells to blank
-        for row in self.grid:
-            for node in row:
-                if node.colour == colours.VISITED_COLOUR or node.colour == colours.QUEUED_COLOUR:
-                    node.colour = colours.BLANK_COLOUR
 
-        if self.is_found:
+        # reset any visited/queued/path cells to blank
+        self.grid.clear_search()
+
+        self.start_cell, self.finish_cell = start_cell, finish_cell
+
+        # the same search is reused for every run, so searches that keep state between runs (LPA*, HPA*) can use it
+        if self.search is None:
+            self.search = self.search_class(self.grid)
+
+        # run the whole search straight away and only show the path
+        if self.instant:
+            return self.finish(self.search.run(start_cell.index, finish_cell.index))
 
-            finish_cell.colour = colours.FINISH_COLOUR
-            curr_cell = finish_cell.prior_cell
+        self.page.is_running = True
+        self.steps = self.search.steps(start_cell.index, finish_cell.index)
+        return None
 
-            while True:
+    def update(self) -> str:
 
-                self.path_length += 1
+        if self.steps is None:
+            return None
 
-                # check if the user wants to quit the program
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        quit()
+        # stop the search if the stop button was pressed (showing the whole path if it had already been found)
+        if not self.page.is_running:
+            self.steps.close()
+            return self.finish(self.search.result)
 
-                # exit the loop if the algorithm has found the path
-                if curr_cell == start_cell:
-                    break
-                
-                # backtrack to the previous cell and load the screen (visualisation page)
-                curr_cell.colour = colours.PATH_COLOUR
-                curr_cell = curr_cell.prior_cell
+        frame_end = time.perf_counter() + 1 / self.target_fps if self.target_fps else None
+        steps = 0
 
-                self.page.load()
-                pygame.display.update()
+        for event, node in self.steps:
 
+            self.apply(event, node)
+
+            # end the frame once enough nodes have been searched/path cells found
+            if event != 'queued':
+                steps += 1
+                if frame_end is None and steps >= self.steps_per_frame:
+                    return None
+                if frame_end is not None and time.perf_counter() >= frame_end:
+                    return None
+
+        return self.finish(self.search.result)
+
+    def finish(self, result: engine.SearchResult) -> str:
+        """ Stores the analysis data once the search has finished (result is None if it was stopped) """
+
+        self.steps = None
         self.page.is_running = False
 
-        # output an appropriate message
-        
-        if not self.is_found:
+        if result is None or not result.is_found:
+            self.clear_search()
             return "path not found"
-        else:
-            return f"[ Dijkstra ] visited {self.nodes_searched} nodes, path length = {self.path_length}," \
-                f" time taken = {self.elapsed_time}s"
 
+        # make sure the whole path is shown (it is only drawn a step at a time when the search isn't instant)
+        for node in result.path[1:-1]:
+            if self.grid.state[node] < State.BARRIER:
+                self.grid.paint(node, State.PATH)
+
+        # store the analysis data
+        self.is_found = result.is_found
+        self.path_length = result.path_length
+        self.nodes_searched = result.nodes_searched
+        self.elapsed_time = round(result.elapsed_time, 3)
+
+        return result.summary()
 
-class AStar:
+
+class Dijkstra(_VisualSearch):
+    """
+    This class provides functionality for running Dijkstra's algorithm on a grid to find
+    the cheapest path from a start cell to a finish cell (adding up the cells' movement costs).
+
+    Attributes:
+
+        surface (pygame.Surface): The surface on which the grid is displayed.
+        page: The current page of the program.
+        grid (Grid): the grid on which the algorithm is to be run.
+
+    Methods:
+
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts Dijkstra's algorithm to find the shortest path.
+            Args:
+                start_cell (Cell): The starting cell of the path.
+                finish_cell (Cell): The ending cell of the path.
+            Returns:
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
+
+    """
+
+    search_class = engine.Dijkstra
+    label = "Dijkstra"
+
+
+class BreadthFirstSearch(_VisualSearch):
+    """
+    This class provides functionality for running a breadth-first search on a grid to find the path with the
+    fewest moves from a start cell to a finish cell (ignoring the cells' movement costs).
+
+    Attributes:
+
+        surface (pygame.Surface): The surface on which the grid is displayed.
+        page: The current page of the program.
+        grid (Grid): the grid on which the algorithm is to be run.
+
+    Methods:
+
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts a breadth-first search to find the path with the fewest moves.
+            Args:
+                start_cell (Cell): The starting cell of the path.
+                finish_cell (Cell): The ending cell of the path.
+            Returns:
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
+
+    """
+
+    search_class = engine.BreadthFirstSearch
+    label = "Breadth-First Search"
+
+
+class AStar(_VisualSearch):
     """
     This class provides functionality for running the A* algorithm on a grid to find
     the shortest path from a start cell to a finish cell.
-    
+
     Attributes:
-    
+
         surface (pygame.Surface): The surface on which the grid is displayed.
         page: The current page of the program.
-        grid (list): the grid on which the algorithm is to be run.
-        
+        grid (Grid): the grid on which the algorithm is to be run.
+
     Methods:
 
-        best_node(self) -> Cell:
-            Returns the cell with the lowest f_cost in the open list
-        check_neighbours(self, cell: Cell) -> None:
-            Adds any new neighbours to the open list and updates costs
-        run(self, start_cell: Cell, finish_cell: Cell) -> str
-            Runs the A* algorithm to find the shortest path.
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts the A* algorithm to find the shortest path.
             Args:
                 start_cell (Cell): The starting cell of the path.
                 finish_cell (Cell): The ending cell of the path.
             Returns:
-                str: A message indicating whether the path was found and its length and time taken.
-            Raises:
-                ValueError: If the start_cell or finish_cell is not placed on the grid.
-    
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
+
     """
-    
-    def __init__(self, surface: pygame.Surface, page, grid: list) -> None:
 
-        # initialise all attributes necessary to load the display
-        self.surface = surface
-        self.page = page
-        
-        # initialise attributes used in the pathfinding algorithm
-        self.grid = grid
-        self.open = []
-        self.visited = []
-        self.is_found = False
+    search_class = engine.AStar
+    label = "A* Algorithm"
 
-        # initialise useful data to help with analysis
-        self.path_length = 0
-        self.nodes_searched = 0
 
-    def best_node(self) -> Cell:
-        """ Returns the cell with the lowest f_cost in the open list """
-
-        best = []  # stores all of the cells with the best f_cost
-        best_f_cost = float('inf')  # stores the value of the best f_cost
-
-        # loops through all nodes currently in the open set
-        for node in self.open:
-            # appends the node to the best array if it is equal to the current best f_cost
-            if node.f_cost == best_f_cost:
-                best.append(node)
-            # resets the best array to just the node if a new best f_cost is found
-            elif node.f_cost < best_f_cost:
-                best = [node]
-                best_f_cost = node.f_cost
-
-        # if only 1 cell has the best f_cost, then return the cell
-        if len(best) == 1:
-            return best[0]
-        # otherwise return the cell with the best g_cost (out of the cells with the best f_cost)
-        else:
-            return min(best, key=lambda node: node.g_cost)
-            
-
-    def check_neighbours(self, cell: Cell) -> None:
-        """ Adds any new neighbours to the open list and updates costs """
-        
-        # loops through all of the current cell's neighbours
-        for neighbour in cell.neighbours:
-
-            # checks if the neighbour's colour is blank or finished
-            if neighbour.colour == colours.BLANK_COLOUR or neighbour.colour == colours.FINISH_COLOUR:
-                
-                # checks whether the g_cost via the current cell is lower than the neighbour's current g_cost
-                if cell.g_cost + 1 < neighbour.g_cost:
-                    # updates the g_cost and prior cell
-                    neighbour.g_cost = cell.g_cost + 1
-                    neighbour.prior_cell = cell
-                    # updates the neighbour's f_cost after the change in g_cost
-                    neighbour.update_costs()
-
-                    # if the cell has not yet been seen, add it to the open set
-                    if neighbour not in self.open and neighbour not in self.visited:
-                        self.open.append(neighbour)
-
-                # make the cell queued
-                neighbour.colour = colours.QUEUED_COLOUR
-        
-
-    def run(self, start_cell: Cell, finish_cell: Cell) -> str:
-        
-        if start_cell and finish_cell:
-
-            # reset any visited/queued cells to blank
-            for row in self.grid:
-                for node in row:
-                    if node.colour == colours.VISITED_COLOUR or node.colour == colours.QUEUED_COLOUR:
-                        node.colour = colours.BLANK_COLOUR
-            
-            # initialise variables
-            self.path_length = 0
-            self.nodes_searched = 1
-
-            self.open = [start_cell]
-            self.is_found = False
-            self.page.is_running = True
-
-            self.start_time = time.time()
-
-            start_cell.g_cost = 0
-            start_cell.update_costs()
-
-            # reset costs and any path cells from previous algorithms
-            for row in self.grid:
-                for node in row:
-
-                    node.h_cost = abs(node.row - finish_cell.row) + abs(node.col - finish_cell.col)
-
-                    if node != start_cell:
-                        node.g_cost = float('inf')
-
-                    node.update_costs()
-
-                    if node.colour == colours.PATH_COLOUR:
-                        node.colour = colours.BLANK_COLOUR
-
-            # ensures that the loop only runs if there are still nodes to explore
-            while self.open and self.page.is_running:
-                
-                self.nodes_searched += 1
-                
-                # check if the user wants to quit the program
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        quit()
-
-                # sets the current cell to the cell with the lowest f_cost in the open list and checks if it is the finish cell
-                curr_cell = self.best_node()
-                if curr_cell == finish_cell:
-                    self.is_found = True
-                    self.elapsed_time = round(time.time() - self.start_time, 3)
-                    return self.backtrack(start_cell, finish_cell)
-
-                self.check_neighbours(curr_cell)
-
-                # remove the current cell from the open list and load the screen (visualisation page)
-                curr_cell.colour = colours.VISITED_COLOUR
-                start_cell.colour = colours.START_COLOUR
-                self.open.remove(curr_cell)
-
-                # load the screen
-                self.page.load()
-                pygame.display.update()
-            
-            return "path not found"
-        
-        else:
-            return "start/finish cell not placed"
+class JumpPointSearch(_VisualSearch):
+    """
+    This class provides functionality for running Jump Point Search (A* that only expands the cells where
+    the path can turn) on a grid to find the shortest path from a start cell to a finish cell.
 
-    def backtrack(self, start_cell: Cell, finish_cell: Cell) -> str:
+    Attributes:
 
-        # reset any visited/queued cells to blank
-        for row in self.grid:
-            for node in row:
-                if node.colour == colours.VISITED_COLOUR or node.colour == colours.QUEUED_COLOUR:
-                    node.colour = colours.BLANK_COLOUR
+        surface (pygame.Surface): The surface on which the grid is displayed.
+        page: The current page of the program.
+        grid (Grid): the grid on which the algorithm is to be run.
 
-        if self.is_found:
+    Methods:
 
-            finish_cell.colour = colours.FINISH_COLOUR
-            curr_cell = finish_cell.prior_cell
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts Jump Point Search to find the shortest path.
+            Args:
+                start_cell (Cell): The starting cell of the path.
+                finish_cell (Cell): The ending cell of the path.
+            Returns:
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
 
-            while True:
+    """
 
-                self.path_length += 1
+    search_class = engine.JumpPointSearch
+    label = "Jump Point Search"
 
-                # check if the user wants to quit the program
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        quit()
 
-                # exit the loop if the algorithm has found the path
-                if curr_cell == start_cell:
-                    break
-                
-                # backtrack to the previous cell and load the screen (visualisation page)
-                curr_cell.colour = colours.PATH_COLOUR
-                curr_cell = curr_cell.prior_cell
+class LifelongAStar(_VisualSearch):
+    """
+    This class provides functionality for running Lifelong Planning A* on a grid to find the shortest path
+    from a start cell to a finish cell. The search is kept between runs, so running it again after editing a
+    few barriers only searches the cells affected by the edits.
 
-                self.page.load()
-                pygame.display.update()
+    Attributes:
 
-        self.page.is_running = False
-        
-        # output an appropriate message
-        if not self.is_found:
-            return "path not found"
-        else:
-            return f"[    A*    ] visited {self.nodes_searched} nodes, path length = {self.path_length}," \
-                f" time taken = {self.elapsed_time}s"
+        surface (pygame.Surface): The surface on which the grid is displayed.
+        page: The current page of the program.
+        grid (Grid): the grid on which the algorithm is to be run.
+
+    Methods:
+
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts (or repairs) Lifelong Planning A* to find the shortest path.
+            Args:
+                start_cell (Cell): The starting cell of the path.
+                finish_cell (Cell): The ending cell of the path.
+            Returns:
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
+
+    """
+
+    search_class = engine.LifelongAStar
+    label = "Lifelong A*"
 
 
-class GreedyBFS:
+class HierarchicalAStar(_VisualSearch):
     """
-    This class provides functionality for running the greedy BFS algorithm on a grid to efficiently find
-    a path from a start cell to a finish cell.
-    
+    This class provides functionality for running Hierarchical Pathfinding A* on a grid to quickly find a
+    (nearly shortest) path from a start cell to a finish cell. The grid's clusters are kept between runs, so
+    only the clusters around edited barriers have to be worked out again.
+
     Attributes:
-    
+
         surface (pygame.Surface): The surface on which the grid is displayed.
         page: The current page of the program.
-        grid (list): the grid on which the algorithm is to be run.
-        
+        grid (Grid): the grid on which the algorithm is to be run.
+
     Methods:
 
-        check_neighbours(self, cell: Cell) -> None:
-            Adds any new neighbours to the open list
-        best_cost(self) -> Cell:
-            Returns the cell with the lowest h_cost in the open list
-        run(self, start_cell: Cell, finish_cell: Cell) -> str
-            Runs the greedy BFS algorithm to find the shortest path.
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts Hierarchical Pathfinding A* to find a path.
             Args:
                 start_cell (Cell): The starting cell of the path.
                 finish_cell (Cell): The ending cell of the path.
             Returns:
-                str: A message indicating whether the path was found and its length and time taken.
-            Raises:
-                ValueError: If the start_cell or finish_cell is not placed on the grid.
-    
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
+
     """
 
-    def __init__(self, surface: pygame.Surface, page, grid: list) -> None:
+    search_class = engine.HierarchicalAStar
+    label = "Hierarchical A*"
 
-        # initialise all attributes necessary to load the display
-        self.surface = surface
-        self.page = page
-        
-        # initialise attributes used in the pathfinding algorithm
-        self.grid = grid
-        self.open = []
-        self.is_found = False
 
-        # initialise useful data to help with analysis
-        self.nodes_searched = 0
-        self.path_length = 0
-    
-    def check_neighbours(self, cell: Cell) -> None:
-        """ Adds any new neighbours to the open list """
-        
-        # loops through all of the current cell's neighbours
-        for neighbour in cell.neighbours:
+class GreedyBFS(_VisualSearch):
+    """
+    This class provides functionality for running the greedy BFS algorithm on a grid to efficiently find
+    a path from a start cell to a finish cell.
 
-            # checks if the neighbour's colour is blank or finished
-            if neighbour.colour == colours.BLANK_COLOUR or neighbour.colour == colours.FINISH_COLOUR:
+    Attributes:
 
-                # adds the neighbour to the open list and sets its colour to queued
-                self.open.append(neighbour)
-                neighbour.colour = colours.QUEUED_COLOUR
-                # sets the neighbour's prior cell to the current cell
-                neighbour.prior_cell = cell
+        surface (pygame.Surface): The surface on which the grid is displayed.
+        page: The current page of the program.
+        grid (Grid): the grid on which the algorithm is to be run.
 
-    
-    def best_cost(self) -> Cell:
-        """ Returns the cell with the lowest h_cost in the open list """
+    Methods:
 
-        return min(self.open, key=lambda node: node.h_cost)
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts the greedy BFS algorithm to find a path.
+            Args:
+                start_cell (Cell): The starting cell of the path.
+                finish_cell (Cell): The ending cell of the path.
+            Returns:
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
 
-    def run(self, start_cell: Cell, finish_cell: Cell) -> str:
-        """Runs the greedy BFS algorithm on the grid to efficiently find a path from the start_cell to the finish_cell.
+    """
 
-        Args:
-            start_cell (Cell): The starting cell of the path.
-            finish_cell (Cell): The ending cell of the path.
+    search_class = engine.GreedyBFS
+    label = "Greedy BFS"
 
-        Returns:
-            str: A message indicating whether the path was found and its length and time taken.
 
-        Raises:
-            ValueError: If the start_cell or finish_cell is not placed on the grid.
-        """
-        
-        if start_cell and finish_cell:
-
-            # reset any visited/queued cells to blank
-            for row in self.grid:
-                for node in row:
-                    if node.colour == colours.VISITED_COLOUR or node.colour == colours.QUEUED_COLOUR:
-                        node.colour = colours.BLANK_COLOUR
-
-            # initialise variables
-            self.nodes_searched = 1
-            self.path_length = 0
-
-            self.open = [start_cell]
-            self.is_found = False
-            self.page.is_running = True
-
-            self.start_time = time.time()
-
-            # reset h_costs and any path cells from previous algorithms
-            for row in self.grid:
-                for node in row:
-                    node.h_cost = abs(node.row - finish_cell.row) + abs(node.col - finish_cell.col)
-                    if node.colour == colours.PATH_COLOUR:
-                        node.colour = colours.BLANK_COLOUR
-
-            # ensures that the loop only runs if there are still nodes to explore
-            while self.open and self.page.is_running:
-
-                self.nodes_searched += 1
-
-                # checks if the user wants to quit the program
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        quit()
-                
-                # sets the current cell to the cell with the lowest h_cost in the open list and checks if it is the finish cell
-                curr_cell = self.best_cost()
-                if curr_cell == finish_cell:
-                    self.is_found = True
-                    self.elapsed_time = round(time.time() - self.start_time, 3)
-                    return self.backtrack(start_cell, finish_cell)
-
-                self.check_neighbours(curr_cell)
-
-                # set newly visited cells to visited and remove the current cell from the open list
-                curr_cell.colour = colours.VISITED_COLOUR
-                start_cell.colour = colours.START_COLOUR
-
-                self.open.remove(curr_cell)
-
-                # load the screen (visualisation page)
-                self.page.load()
-                pygame.display.update()
-            
-            return "path not found"
-        
-        else:
-            return "start/finish cell not placed"
+class BidirectionalBFS(_VisualSearch):
+    """
+    This class provides functionality for running a bidirectional breadth-first search on a grid to find
+    the shortest path from a start cell to a finish cell.
 
+    Attributes:
 
-    def backtrack(self, start_cell, finish_cell) -> str:
-        
-        # reset any visited/queued cells to blank
-        for row in self.grid:
-            for node in row:
-                if node.colour == colours.VISITED_COLOUR or node.colour == colours.QUEUED_COLOUR:
-                    node.colour = colours.BLANK_COLOUR
+        surface (pygame.Surface): The surface on which the grid is displayed.
+        page: The current page of the program.
+        grid (Grid): the grid on which the algorithm is to be run.
 
-        if self.is_found:
+    Methods:
 
-            finish_cell.colour = colours.FINISH_COLOUR
-            curr_cell = finish_cell.prior_cell
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts a bidirectional breadth-first search to find the shortest path.
+            Args:
+                start_cell (Cell): The starting cell of the path.
+                finish_cell (Cell): The ending cell of the path.
+            Returns:
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
 
-            while True:
+    """
 
-                self.path_length += 1
+    search_class = engine.BidirectionalBFS
+    label = "Bidirectional BFS"
 
-                # check if the user wants to quit the program
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        quit()
 
-                # exit the loop if the algorithm has found the path
-                if curr_cell == start_cell:
-                    break
-                
-                # backtrack to the previous cell and load the screen (visualisation page)
-                curr_cell.colour = colours.PATH_COLOUR
-                curr_cell = curr_cell.prior_cell
+class BidirectionalAStar(_VisualSearch):
+    """
+    This class provides functionality for running the bidirectional A* algorithm on a grid to find
+    the shortest path from a start cell to a finish cell.
 
-                self.page.load()
-                pygame.display.update()
+    Attributes:
 
-        self.page.is_running = False
-        
-        # output an appropriate message
-        
-        if not self.is_found:
-            return "path not found"
-        else:
-            return f"[Greedy BFS] visited {self.nodes_searched} nodes, path length = {self.path_length}," \
-                f" time taken = {self.elapsed_time}s"
\ No newline at end of file
+        surface (pygame.Surface): The surface on which the grid is displayed.
+        page: The current page of the program.
+        grid (Grid): the grid on which the algorithm is to be run.
+
+    Methods:
+
+        start(self, start_cell: Cell, finish_cell: Cell) -> str
+            Starts the bidirectional A* algorithm to find the shortest path.
+            Args:
+                start_cell (Cell): The starting cell of the path.
+                finish_cell (Cell): The ending cell of the path.
+            Returns:
+                str: The analysis message if the algorithm has already finished (None if it is still running).
+        update(self) -> str
+            Takes the next frame's worth of steps.
+            Returns:
+                str: The analysis message if the algorithm has finished (None if it is still running).
+
+    """
+
+    search_class = engine.BidirectionalAStar
+    label = "Bidirectional A*"
@@ -134,6 +134,10 @@ class Button:
         self.text = new_text
         self.info = self.font.render(self.text, True, self.fg)
 
+        # resize the button to fit the new text
+        self.info_rect = self.info.get_rect(center=self.center)
+        self.button_rect = self.info_rect.inflate(20, 20)
+
     def update(self) -> None:
         """Method to check interactions with the button"""
 
@@ -0,0 +1,271 @@
+"""
+A module for answering many start/finish queries on the same grid without the visualisation.
+
+One search object is created for the whole batch and reused for every query, so its arrays and anything it
+works out from the grid are only set up once (and thanks to the search's generation marks, nothing the size
+of the grid is cleared between queries). The search is private, so it keeps its prior cells and costs in
+arrays of its own: the grid's states, prior cells and costs are left exactly as they were.
+
+Before searching, the walkable cells are split into connected regions (once for the whole batch). A query whose
+start and finish are in different regions is answered as not found straight away, instead of searching every
+cell the start can reach.
+
+The queries can also be spread over several processes with run_parallel. The grid's state array, neighbour
+index and movement costs (and the region labels) are copied into shared memory once, and each worker process
+builds a Grid around them (with the same connectivity) without copying, so nothing the size of the grid is
+pickled per query.
+
+Usage:
+    grid = Grid(100, 100)
+    queries = [(grid.index(1, 1), grid.index(98, 98)), (grid.index(5, 5), grid.index(50, 60))]
+    batch = run_batch(grid, queries, 'astar')
+    print(batch.summary())
+    paths = [result.path for result in batch.results]
+
+    astar, jps = run_parallel(grid, queries, ['astar', 'jps'], processes=8)
+
+Classes:
+    BatchResult:
+        Stores the results of a batch of queries and the time the whole batch took.
+
+        Methods:
+            summary() -> str:
+                Returns a one line summary of the batch.
+
+Functions:
+    regions(grid: Grid) -> array:
+        Labels every walkable cell with the connected region it belongs to.
+    run_batch(grid: Grid, queries: list, algorithm: str='astar', heuristic: str=None,
+              check_regions: bool=True) -> BatchResult:
+        Runs a search for every (start, finish) pair and returns the results.
+    run_parallel(grid: Grid, queries: list, algorithms: list=('astar',), heuristic: str=None,
+                 processes: int=None, chunk_size: int=None, check_regions: bool=True) -> list:
+        Runs the queries for every algorithm across a pool of processes and returns a BatchResult per algorithm.
+"""
+
+import math
+import multiprocessing
+import time
+from array import array
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# import necessary project files
+import engine
+from grid import Grid, State
+
+
+class BatchResult:
+    """
+    Stores the results of a batch of queries.
+
+    Attributes:
+        algorithm (str): The name of the algorithm used (a key of engine.ALGORITHMS).
+        queries (list): The (start, finish) pairs, as flat cell indices.
+        results (list): The SearchResult of each query, in the same order as the queries.
+        elapsed_time (float): The time taken by the whole batch in seconds (for a parallel batch, the total time
+            the worker processes spent on this algorithm's queries).
+    """
+
+    def __init__(self, algorithm: str, queries: list, results: list, elapsed_time: float) -> None:
+
+        self.algorithm = algorithm
+        self.queries = queries
+        self.results = results
+        self.elapsed_time = elapsed_time
+
+    @property
+    def found_count(self) -> int:
+        return sum(result.is_found for result in self.results)
+
+    @property
+    def queries_per_second(self) -> float:
+        return len(self.results) / self.elapsed_time if self.elapsed_time > 0 else float('inf')
+
+    @property
+    def nodes_per_query(self) -> float:
+        """ The mean number of nodes searched per query """
+
+        return sum(result.nodes_searched for result in self.results) / max(len(self.results), 1)
+
+    def summary(self) -> str:
+        """ Returns a one line summary of the batch """
+
+        return f"[{self.algorithm}] {len(self.results)} queries ({self.found_count} found) in " \
+            f"{round(self.elapsed_time, 3)}s, {self.queries_per_second:.1f} queries/s, " \
+            f"{self.nodes_per_query:.1f} nodes/query"
+
+
+def regions(grid: Grid) -> array:
+    """ Labels every walkable cell with the connected region it belongs to (barriers are labelled -1) """
+
+    labels = array('i', [-1]) * grid.size
+    links, offsets = grid.links.data, grid.offsets
+    region = 0
+
+    for cell in np.flatnonzero(grid.state < State.BARRIER).tolist():
+        if labels[cell] != -1:
+            continue
+
+        # flood the region from the first cell that hasn't been labelled yet
+        labels[cell] = region
+        stack = [cell]
+        while stack:
+            node = stack.pop()
+            for offset in offsets[links[node]]:
+                if labels[node + offset] == -1:
+                    labels[node + offset] = region
+                    stack.append(node + offset)
+
+        region += 1
+
+    return labels
+
+
+def run_batch(grid: Grid, queries: list, algorithm: str='astar', heuristic: str=None,
+              check_regions: bool=True) -> BatchResult:
+    """
+    Runs a search for every (start, finish) pair, without changing the grid.
+
+    Args:
+        grid (Grid): The grid to search.
+        queries (list): The (start, finish) pairs, as flat cell indices (see Grid.index).
+        algorithm (str): The name of the algorithm (a key of engine.ALGORITHMS).
+        heuristic (str): The heuristic used by the searches that need one (a key of engine.HEURISTICS, or None for
+            the one matching the grid's connectivity).
+        check_regions (bool): If True, the grid is split into connected regions first, so queries between
+            regions are answered without searching (worth it unless there are only a few queries on a big grid).
+
+    Returns:
+        BatchResult: The path and analysis data of every query.
+    """
+
+    batch_start = time.perf_counter()
+
+    search = engine.ALGORITHMS[algorithm](grid, heuristic, private=True)
+    labels = regions(grid) if check_regions else None
+    results = _run_queries(search, queries, labels)
+
+    return BatchResult(algorithm, list(queries), results, time.perf_counter() - batch_start)
+
+
+def _run_queries(search: engine.Search, queries: list, labels) -> list:
+    """ Runs the search for every query, skipping queries between different regions (if labels isn't None) """
+
+    results = []
+
+    for start, finish in queries:
+        if labels is not None and (labels[start] != labels[finish] or labels[start] == -1):
+            results.append(engine.SearchResult(search.name, [], 0, 0.0))
+        else:
+            results.append(search.run(start, finish))
+
+    return results
+
+
+# the grid (and region labels) shared with a worker process, and the searches it has created so far
+_worker = {}
+
+
+def _attach(name: str, rows: int, cols: int, has_labels: bool, connectivity: int, corner_cutting: str) -> None:
+    """ Sets up a worker process: builds a Grid around the arrays in the shared memory block """
+
+    # the pool's workers share the parent process's resource tracker, so the block is only removed by the parent
+    block = shared_memory.SharedMemory(name=name)
+
+    size = rows * cols
+    state = np.ndarray(size, dtype=np.uint8, buffer=block.buf)
+    links = np.ndarray(size, dtype=np.uint8, buffer=block.buf, offset=size)
+    cost = np.ndarray(size, dtype=np.uint8, buffer=block.buf, offset=2 * size)
+    labels = np.ndarray(size, dtype=np.int32, buffer=block.buf, offset=_labels_offset(size)) if has_labels else None
+
+    grid = Grid(rows, cols, state, links, cost, connectivity, corner_cutting)
+    _worker.update(block=block, grid=grid, searches={}, labels=None if labels is None else labels.data)
+
+
+def _labels_offset(size: int) -> int:
+    """ Returns where the region labels start in the shared memory block (after the state, neighbour index and
+    costs) """
+
+    return (3 * size + 3) // 4 * 4
+
+
+def _run_chunk(task: tuple) -> tuple:
+    """ Runs a chunk of queries in a worker process and returns the results and the time they took """
+
+    algorithm, heuristic, queries = task
+    chunk_start = time.perf_counter()
+
+    # each worker keeps one search per algorithm, so its arrays are reused for every chunk
+    key = (algorithm, heuristic)
+    if key not in _worker['searches']:
+        _worker['searches'][key] = engine.ALGORITHMS[algorithm](_worker['grid'], heuristic, private=True)
+
+    results = _run_queries(_worker['searches'][key], queries, _worker['labels'])
+    return results, time.perf_counter() - chunk_start
+
+
+def run_parallel(grid: Grid, queries: list, algorithms: list=('astar',), heuristic: str=None,
+                 processes: int=None, chunk_size: int=None, check_regions: bool=True) -> list:
+    """
+    Runs the queries for every algorithm across a pool of processes, without changing the grid.
+
+    Each task sent to a worker is one algorithm and a chunk of the queries, so both the queries and the
+    algorithms are spread over the processes.
+
+    Args:
+        grid (Grid): The grid to search.
+        queries (list): The (start, finish) pairs, as flat cell indices (see Grid.index).
+        algorithms (list): The names of the algorithms to run (keys of engine.ALGORITHMS).
+        heuristic (str): The heuristic used by the searches that need one (a key of engine.HEURISTICS, or None for
+            the one matching the grid's connectivity).
+        processes (int): The number of worker processes (the number of CPUs by default). With 1 process the
+            batches are run in this process instead.
+        chunk_size (int): The number of queries in each task (by default, enough for about 4 tasks per process
+            and algorithm, so the work stays balanced when some queries take longer than others).
+        check_regions (bool): If True, the grid is split into connected regions first (see run_batch).
+
+    Returns:
+        list: A BatchResult for each algorithm, in the same order as algorithms.
+    """
+
+    processes = processes or multiprocessing.cpu_count()
+    if processes == 1:
+        return [run_batch(grid, queries, algorithm, heuristic, check_regions) for algorithm in algorithms]
+
+    queries = list(queries)
+    chunk_size = chunk_size or max(1, math.ceil(len(queries) / (processes * 4)))
+    tasks = [(algorithm, heuristic, queries[i:i + chunk_size])
+             for algorithm in algorithms for i in range(0, len(queries), chunk_size)]
+
+    # copy the state array, neighbour index, costs and region labels into one shared memory block
+    size = grid.size
+    block = shared_memory.SharedMemory(create=True, size=_labels_offset(size) + 4 * size)
+
+    try:
+        np.ndarray(size, dtype=np.uint8, buffer=block.buf)[:] = grid.state
+        np.ndarray(size, dtype=np.uint8, buffer=block.buf, offset=size)[:] = grid.links
+        np.ndarray(size, dtype=np.uint8, buffer=block.buf, offset=2 * size)[:] = grid.cost
+        if check_regions:
+            np.ndarray(size, dtype=np.int32, buffer=block.buf, offset=_labels_offset(size))[:] = regions(grid)
+
+        worker_args = (block.name, grid.rows, grid.cols, check_regions, grid.connectivity, grid.corner_cutting)
+        with multiprocessing.Pool(processes, _attach, worker_args) as pool:
+            chunks = pool.map(_run_chunk, tasks, chunksize=1)
+
+    finally:
+        block.close()
+        block.unlink()
+
+    # join the chunks of each algorithm back together (the tasks are in the same order as the algorithms)
+    batches = []
+    for algorithm in algorithms:
+        results, elapsed_time = [], 0.0
+        for task, (chunk_results, chunk_time) in zip(tasks, chunks):
+            if task[0] == algorithm:
+                results += chunk_results
+                elapsed_time += chunk_time
+        batches.append(BatchResult(algorithm, queries, results, elapsed_time))
+
+    return batches
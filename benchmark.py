@@ -0,0 +1,353 @@
+"""
+A module for benchmarking the pathfinding algorithms without the visualisation.
+
+This module generates grids of different layouts and sizes, runs each algorithm from engine.ALGORITHMS on them
+headlessly and records how long each search took, how many nodes it expanded, its peak memory use and the
+length and cost of the path it found. With --max-cost, every cell is given a random movement cost, so the
+algorithms can be compared on weighted terrain, and with --connectivity 8 the grids allow diagonal moves. The
+results are printed as a table and can be saved as CSV or JSON. With --check-replanning, LPA* is run on small
+random grids that are edited between runs instead, and each path cost is checked against Dijkstra's algorithm.
+
+Usage:
+    python benchmark.py --sizes 50 200 1000 --densities 0.1 0.3 --repeats 3 --output results.csv
+    python benchmark.py --sizes 200 --max-cost 9 --algorithms dijkstra astar bfs
+    python benchmark.py --sizes 200 --connectivity 8 --corner-cutting never --layouts open random
+    python benchmark.py --check-replanning 200 --connectivity 8 --corner-cutting always
+
+Functions:
+    open_grid(size: int, rng: np.random.Generator) -> tuple:
+        Creates a grid with no barriers.
+    random_grid(size: int, rng: np.random.Generator, density: float) -> tuple:
+        Creates a grid where each cell is a barrier with the given probability.
+    maze_grid(size: int, rng: np.random.Generator) -> tuple:
+        Creates a maze (every open cell is connected by exactly one path).
+    corridor_grid(size: int, rng: np.random.Generator) -> tuple:
+        Creates a grid of long corridors joined end to end.
+    add_terrain(grid: Grid, rng: np.random.Generator, max_cost: int) -> None:
+        Gives every cell a random movement cost from 1 to max_cost.
+    benchmark(algorithm: str, grid: Grid, start: int, finish: int, repeats: int=3, memory: bool=True,
+              heuristic: str=None) -> dict:
+        Runs an algorithm on a grid and returns its measurements.
+    run_benchmarks(sizes: list, layouts: list, densities: list, algorithms: list, repeats: int=3,
+                   memory: bool=True, seed: int=0, heuristic: str=None, max_cost: int=1, connectivity: int=4,
+                   corner_cutting: str='never') -> list:
+        Runs every algorithm on every grid and returns a list of measurements.
+    check_replanning(runs: int, seed: int=0, max_cost: int=1, connectivity: int=8, corner_cutting: str='never',
+                     edits: int=8) -> int:
+        Checks LPA* against Dijkstra's algorithm on grids edited between runs and returns the number of mismatches.
+    save_results(results: list, path: str) -> None:
+        Saves the results as CSV or JSON (depending on the file extension).
+
+Each grid function returns a tuple of (grid, start, finish), where start and finish are flat cell indices.
+"""
+
+import argparse
+import csv
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+# import necessary project files
+import engine
+from grid import CORNER_RULES, MAX_COST, Grid, State
+
+
+def _new_grid(size: int) -> Grid:
+    """ Creates a blank square grid with a border """
+
+    grid = Grid(size, size)
+    grid.add_border()
+    return grid
+
+
+def open_grid(size: int, rng: np.random.Generator) -> tuple:
+    """ Creates a grid with no barriers """
+
+    grid = _new_grid(size)
+    return grid, grid.index(1, 1), grid.index(size - 2, size - 2)
+
+
+def random_grid(size: int, rng: np.random.Generator, density: float) -> tuple:
+    """ Creates a grid where each cell is a barrier with the given probability (like Visualisation.random_func) """
+
+    grid = _new_grid(size)
+    start, finish = grid.index(1, 1), grid.index(size - 2, size - 2)
+
+    barriers = (grid.state == State.BLANK) & (rng.random(grid.size) < density)
+    grid.state[barriers] = State.BARRIER
+    grid.state[[start, finish]] = State.BLANK
+    grid.recount()
+
+    return grid, start, finish
+
+
+def maze_grid(size: int, rng: np.random.Generator) -> tuple:
+    """
+    Creates a maze (every open cell is connected by exactly one path).
+
+    The cells at odd rows and columns are opened up, and each one is joined to the cell above or to the right
+    of it at random (a binary tree maze), which can be done for the whole grid at once with NumPy.
+    """
+
+    grid = _new_grid(size)
+    state = grid.state.reshape(size, size)
+    state[1:-1, 1:-1] = State.BARRIER
+
+    rows, cols = np.meshgrid(np.arange(1, size - 1, 2), np.arange(1, size - 1, 2), indexing='ij')
+    state[rows, cols] = State.BLANK
+
+    # cells on the top row can only be joined to the right, and cells in the last column only upwards
+    north = rng.random(rows.shape) < 0.5
+    north[0, :] = False
+    north[:, -1] = True
+    north[0, -1] = False
+    east = ~north
+    east[0, -1] = False
+
+    state[rows[north] - 1, cols[north]] = State.BLANK
+    state[rows[east], cols[east] + 1] = State.BLANK
+    grid.recount()
+
+    return grid, grid.index(1, 1), grid.index(int(rows[-1, -1]), int(cols[-1, -1]))
+
+
+def corridor_grid(size: int, rng: np.random.Generator) -> tuple:
+    """ Creates a grid of long corridors joined end to end (the path has to zigzag across the whole grid) """
+
+    grid = _new_grid(size)
+    state = grid.state.reshape(size, size)
+
+    # add a wall every third row, leaving a gap at alternating ends
+    for i, row in enumerate(range(3, size - 2, 3)):
+        state[row, 1:-1] = State.BARRIER
+        if i % 2 == 0:
+            state[row, -2] = State.BLANK
+        else:
+            state[row, 1] = State.BLANK
+    grid.recount()
+
+    return grid, grid.index(1, 1), grid.index(size - 2, size - 2)
+
+
+def add_terrain(grid: Grid, rng: np.random.Generator, max_cost: int) -> None:
+    """ Gives every cell a random movement cost from 1 to max_cost """
+
+    grid.cost[:] = rng.integers(1, max_cost + 1, grid.size)
+    grid.recount()
+
+
+LAYOUTS = {
+    'open': open_grid,
+    'random': random_grid,
+    'maze': maze_grid,
+    'corridor': corridor_grid
+}
+
+
+def benchmark(algorithm: str, grid: Grid, start: int, finish: int, repeats: int=3, memory: bool=True,
+              heuristic: str=None) -> dict:
+    """
+    Runs an algorithm on a grid and returns its measurements.
+
+    Args:
+        algorithm (str): The name of the algorithm (a key of engine.ALGORITHMS).
+        grid (Grid): The grid to search.
+        start (int): The index of the starting cell.
+        finish (int): The index of the finishing cell.
+        repeats (int): The number of timed runs (the fastest one is recorded). The runs share one search object,
+            as the visualisation's do, so only the first run pays for setting up the search's arrays. Searches that
+            keep what they found between runs (engine.Search.keeps_state) get a new object for every run instead,
+            as a repeat on the same grid would otherwise have nothing left to search.
+        memory (bool): If True, one extra run is made with tracemalloc to measure the peak memory use.
+        heuristic (str): The heuristic used by the searches that need one (a key of engine.HEURISTICS, or None for
+            the one matching the grid's connectivity).
+
+    Returns:
+        dict: The wall time, search time, nodes expanded, path length and peak memory of the search.
+    """
+
+    search_class = engine.ALGORITHMS[algorithm]
+    best_time, best_result = float('inf'), None
+    search = search_class(grid, heuristic)
+
+    for repeat in range(repeats):
+        if repeat and search_class.keeps_state:
+            search = search_class(grid, heuristic)
+
+        run_start = time.perf_counter()
+        result = search.run(start, finish)
+        wall_time = time.perf_counter() - run_start
+
+        if wall_time < best_time:
+            best_time, best_result = wall_time, result
+
+    # tracemalloc slows the search down a lot, so memory is measured on a separate run
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        search_class(grid, heuristic).run(start, finish)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        'algorithm': algorithm,
+        'found': best_result.is_found,
+        'path_length': best_result.path_length if best_result.is_found else None,
+        'path_cost': best_result.path_cost if best_result.is_found else None,
+        'nodes_expanded': best_result.nodes_searched,
+        'wall_time': round(best_time, 6),
+        'search_time': round(best_result.elapsed_time, 6),
+        'peak_memory': peak_memory
+    }
+
+
+def run_benchmarks(sizes: list, layouts: list, densities: list, algorithms: list, repeats: int=3,
+                   memory: bool=True, seed: int=0, heuristic: str=None, max_cost: int=1, connectivity: int=4,
+                   corner_cutting: str='never') -> list:
+    """ Runs every algorithm on every grid (weighted with random costs up to max_cost, if it is above 1, and
+    with the given connectivity) and returns a list of measurements (one dict per search) """
+
+    results = []
+
+    for size in sizes:
+        for layout in layouts:
+
+            # only the random layout depends on the barrier density
+            for density in (densities if layout == 'random' else [None]):
+
+                rng = np.random.default_rng(seed)
+                if layout == 'random':
+                    grid, start, finish = random_grid(size, rng, density)
+                else:
+                    grid, start, finish = LAYOUTS[layout](size, rng)
+                if max_cost > 1:
+                    add_terrain(grid, rng, max_cost)
+                if connectivity != 4:
+                    grid.set_connectivity(connectivity, corner_cutting)
+
+                for algorithm in algorithms:
+                    row = {'layout': layout, 'density': density, 'max_cost': max_cost, 'connectivity': connectivity,
+                           'rows': grid.rows, 'cols': grid.cols, 'cells': grid.size}
+                    row.update(benchmark(algorithm, grid, start, finish, repeats, memory, heuristic))
+                    results.append(row)
+                    print_result(row)
+
+    return results
+
+
+def check_replanning(runs: int, seed: int=0, max_cost: int=1, connectivity: int=8, corner_cutting: str='never',
+                     edits: int=8) -> int:
+    """
+    Checks LPA* against Dijkstra's algorithm on grids that are edited between runs.
+
+    Each run makes a random grid (5 to 30 cells across, a quarter of them barriers), searches it with one LPA*
+    object, then toggles a random cell between blank and barrier (or gives it a new cost, on weighted grids) and
+    searches again, edits times over. Every search is compared with a fresh Dijkstra on the same grid.
+
+    Returns:
+        int: The number of searches whose result (found or not, and the path cost) didn't match.
+    """
+
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+
+    for _ in range(runs):
+        grid, start, finish = random_grid(int(rng.integers(5, 31)), rng, 0.25)
+        if max_cost > 1:
+            add_terrain(grid, rng, max_cost)
+        grid.set_connectivity(connectivity, corner_cutting)
+        search = engine.LifelongAStar(grid, private=True)
+
+        for edit in range(edits + 1):
+            if edit:
+                cell = int(rng.integers(grid.size))
+                if cell in (start, finish):
+                    continue
+                if max_cost > 1 and rng.random() < 0.5:
+                    grid.set_cost(cell, int(rng.integers(1, max_cost + 1)))
+                else:
+                    grid.set_state(cell, State.BLANK if grid.state[cell] == State.BARRIER else State.BARRIER)
+
+            result = search.run(start, finish)
+            expected = engine.Dijkstra(grid, private=True).run(start, finish)
+            if result.is_found != expected.is_found or \
+                    (result.is_found and abs(result.path_cost - expected.path_cost) > 1e-3):
+                mismatches += 1
+                print(f"mismatch on a {grid.rows}x{grid.cols} grid after {edit} edits: "
+                      f"LPA* {result.summary()} / Dijkstra {expected.summary()}")
+
+    print(f"checked LPA* on {runs} edited grids: {mismatches} mismatches")
+    return mismatches
+
+
+def print_result(row: dict) -> None:
+    """ Prints one measurement as a line of the results table """
+
+    layout = row['layout'] if row['density'] is None else f"{row['layout']} {row['density']}"
+    memory = '-' if row['peak_memory'] is None else f"{row['peak_memory'] / 1024:.0f} KiB"
+    path_length = '-' if row['path_length'] is None else row['path_length']
+    path_cost = ''
+    if (row['max_cost'] > 1 or row['connectivity'] == 8) and row['path_cost'] is not None:
+        path_cost = f", path cost = {round(row['path_cost'], 2)}"
+
+    print(f"{layout:<12} {row['rows']:>5}x{row['cols']:<5} {row['algorithm']:<20} "
+          f"time = {row['wall_time']:.4f}s, nodes = {row['nodes_expanded']}, "
+          f"path length = {path_length}{path_cost}, memory = {memory}")
+
+
+def save_results(results: list, path: str) -> None:
+    """ Saves the results as JSON if the path ends in .json, otherwise as CSV """
+
+    with open(path, 'w', newline='') as file:
+        if path.endswith('.json'):
+            json.dump(results, file, indent=2)
+        elif results:
+            writer = csv.DictWriter(file, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Benchmark the pathfinding algorithms without the visualisation")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 1000],
+                        help="side lengths of the (square) grids")
+    parser.add_argument('--layouts', nargs='+', default=list(LAYOUTS), choices=list(LAYOUTS))
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.1, 0.2, 0.3],
+                        help="barrier densities used by the random layout")
+    parser.add_argument('--algorithms', nargs='+', default=list(engine.ALGORITHMS), choices=list(engine.ALGORITHMS))
+    parser.add_argument('--repeats', type=int, default=3, help="timed runs per search (the fastest is recorded)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the (slow) peak memory measurement")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--heuristic', choices=list(engine.HEURISTICS),
+                        help="heuristic used by the searches that need one (by default octile on 8-connected grids "
+                             "and manhattan otherwise)")
+    parser.add_argument('--max-cost', type=int, default=1, choices=range(1, MAX_COST + 1), metavar='COST',
+                        help="give every cell a random movement cost from 1 to COST (1 leaves the grids unweighted)")
+    parser.add_argument('--connectivity', type=int, default=4, choices=[4, 8],
+                        help="4 for straight moves only, 8 to allow diagonal moves")
+    parser.add_argument('--corner-cutting', default='never', choices=list(CORNER_RULES),
+                        help="when a diagonal move can pass the corner of a barrier (on 8-connected grids)")
+    parser.add_argument('--output', help="file to save the results to (.csv or .json)")
+    parser.add_argument('--check-replanning', type=int, metavar='RUNS',
+                        help="instead of benchmarking, check LPA* against Dijkstra on RUNS grids edited between runs")
+    args = parser.parse_args()
+
+    if args.check_replanning:
+        mismatches = check_replanning(args.check_replanning, args.seed, args.max_cost, args.connectivity,
+                                      args.corner_cutting)
+        raise SystemExit(1 if mismatches else 0)
+
+    results = run_benchmarks(args.sizes, args.layouts, args.densities, args.algorithms,
+                             args.repeats, not args.no_memory, args.seed, args.heuristic, args.max_cost,
+                             args.connectivity, args.corner_cutting)
+
+    if args.output:
+        save_results(results, args.output)
+
+
+# checks that the main() function is being run from this file (benchmark.py), and not elsewhere
+if __name__ == '__main__':
+    main()
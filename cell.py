@@ -2,48 +2,85 @@ import pygame
 
 # import necessary project files
 import colours
+from grid import Grid, State
 
 pygame.init()
 
 
 class Cell:
-    
-    def __init__(self, row: int, col: int, width: int, colour: tuple=colours.BLANK_COLOUR) -> None:
+    """ A view of a single cell in a Grid (the cell's data is stored in the grid's arrays) """
 
-        # initialise attributes describing the cell's characteristics (dimensions, location, colour)
+    def __init__(self, grid: Grid, row: int, col: int, width: int) -> None:
+
+        # initialise attributes describing the cell's characteristics (dimensions, location)
+        self.grid = grid
         self.row, self.col = row, col
+        self.index = grid.index(row, col)
         self.width = width
         self.x, self.y = self.col * self.width, self.row * self.width
-        self.colour = colour
         self.rect = (self.x, self.y, self.width, self.width)
 
-        # create a data structure to store all of the cell's neighbours
-        self.neighbours = []
-        self.prior_cell = None  # attribute to store the cell before itself in the final path 
-        
-        self.g_cost = float('inf')  # the cost from the start node to this cell
-        self.h_cost = float('inf')  # the estimated cost from this cell to the target cell
-        self.f_cost = float('inf')  # the g_cost + h_cost
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Cell) and self.grid is other.grid and self.index == other.index
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def __hash__(self) -> int:
+        return hash(self.index)
 
-        pygame.draw.rect(surface, self.colour, self.rect)
+    @property
+    def state(self) -> State:
+        return State(self.grid.state[self.index])
+
+    @state.setter
+    def state(self, state: State) -> None:
+        self.grid.set_state(self.index, state)
+
+    @property
+    def cost(self) -> int:
+        # the cost of moving onto this cell
+        return int(self.grid.cost[self.index])
+
+    @cost.setter
+    def cost(self, cost: int) -> None:
+        self.grid.set_cost(self.index, cost)
+
+    @property
+    def colour(self) -> tuple:
+        # the colour the cell is drawn with (derived from its state, and its cost if it is blank)
+        if self.state == State.BLANK:
+            return colours.TERRAIN_COLOURS[min(self.cost, len(colours.TERRAIN_COLOURS) - 1)]
+        return colours.STATE_COLOURS[self.state]
 
-    def update_costs(self) -> None:
+    @property
+    def prior_cell(self):
+        """ The cell before this one in the final path (None if there isn't one) """
 
-        self.f_cost = self.h_cost + self.g_cost
+        parent = int(self.grid.parent[self.index])
+        if parent < 0:
+            return None
+        return Cell(self.grid, *self.grid.position(parent), self.width)
 
-    def update_neighbours(self, rows: int, cols: int, grid: list) -> None:
-        """ updates the list of neighboring cells. """
-        
-        self.neighbours = []
+    @property
+    def g_cost(self) -> float:
+        # the cost from the start node to this cell
+        return float(self.grid.g_cost[self.index])
 
-        if self.row > 0:
-            self.neighbours.append(grid[self.row-1][self.col])
-        if self.row < rows - 1:
-            self.neighbours.append(grid[self.row+1][self.col])
-        if self.col > 0:
-            self.neighbours.append(grid[self.row][self.col-1])
-        if self.col < cols - 1:
-            self.neighbours.append(grid[self.row][self.col+1])
+    @property
+    def h_cost(self) -> float:
+        # the estimated cost from this cell to the target cell
+        return float(self.grid.h_cost[self.index])
 
+    @property
+    def f_cost(self) -> float:
+        # the g_cost + h_cost
+        return self.g_cost + self.h_cost
+
+    @property
+    def neighbours(self) -> list:
+        """ The walkable cells this cell can move to, diagonally too on an 8-connected grid (looked up in the grid's
+        neighbour index) """
+
+        return [Cell(self.grid, *self.grid.position(index), self.width) for index in self.grid.neighbours(self.index)]
+
+    def draw(self, surface: pygame.Surface) -> None:
+
+        pygame.draw.rect(surface, self.colour, self.rect)
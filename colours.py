@@ -1,3 +1,6 @@
+# import necessary project files
+from grid import State
+
 
 # GRID COLOURS:
 GRID_LINES_COLOUR = (50, 50, 50)
@@ -13,6 +16,43 @@ QUEUED_COLOUR = (0, 100, 100)
 VISITED_COLOUR = (0, 0, 0)
 PATH_COLOUR = (128, 51, 135)
 
+# the colour each cell state is drawn with
+STATE_COLOURS = {
+    State.BLANK: BLANK_COLOUR,
+    State.START: START_COLOUR,
+    State.FINISH: FINISH_COLOUR,
+    State.QUEUED: QUEUED_COLOUR,
+    State.VISITED: VISITED_COLOUR,
+    State.PATH: PATH_COLOUR,
+    State.BARRIER: BARRIER_COLOUR,
+    State.BORDER: BORDER_COLOUR
+}
+
+# TERRAIN COLOURS:
+
+TERRAIN_COLOUR = (120, 85, 40)
+
+# the colour a blank cell is drawn with for each movement cost, from BLANK_COLOUR (cost 1) to TERRAIN_COLOUR
+# (cost 9, which is also used for any higher cost)
+TERRAIN_COLOURS = [BLANK_COLOUR] + [
+    tuple(round(blank + (terrain - blank) * (cost - 1) / 8) for blank, terrain in zip(BLANK_COLOUR, TERRAIN_COLOUR))
+    for cost in range(1, 10)
+]
+
+# COMPARISON COLOURS (the colour each algorithm's path is drawn with when comparing them):
+
+COMPARE_COLOURS = [
+    (230, 159, 0),
+    (86, 180, 233),
+    (0, 158, 115),
+    (240, 228, 66),
+    (0, 114, 178),
+    (213, 94, 0),
+    (204, 121, 167),
+    (255, 255, 255),
+    (160, 160, 160)
+]
+
 # UI COLOURS:
 
 UI_BG_COLOUR = (50, 50, 50)
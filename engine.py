@@ -0,0 +1,1571 @@
+"""
+A module containing the headless pathfinding engine used by the visualisation.
+
+This module runs the pathfinding algorithms on a plain grid without any pygame rendering, so searches can be
+timed on their own and run without a display. Each search is a generator of step events, which the pygame
+classes in algorithms.py pull from at their own frame rate; run() searches without producing any events.
+
+The grid is a grid.Grid, and cells are referred to by their flat index (row * cols + col). The search writes
+each cell's prior cell and costs into the grid's arrays.
+
+Moving onto a cell costs the cell's movement cost (grid.Grid.cost). Dijkstra, AStar, BidirectionalAStar,
+LifelongAStar and HierarchicalAStar add up these costs, and their heuristics are multiplied by the grid's lowest
+movement cost so they never overestimate. BreadthFirstSearch, BidirectionalBFS and GreedyBFS ignore the costs
+(so their paths have the fewest moves, not the lowest cost), and JumpPointSearch expands every neighbour like A*
+whenever the grid is weighted.
+
+On an 8-connected grid (see grid.Grid.connectivity) the searches also move diagonally, and a diagonal move costs
+sqrt(2) times the cell's movement cost. The heuristic defaults to the octile distance there (and to the
+Manhattan distance on a 4-connected grid).
+
+Classes:
+    SearchResult:
+        Stores the outcome of a search (path, nodes searched, path length and time taken).
+
+        Methods:
+            summary() -> str:
+                Returns the analysis message printed by the visualisation.
+
+    Search:
+        The base class for all of the search algorithms.
+
+        Methods:
+            __init__(grid: Grid, heuristic: str=None, private: bool=False) -> None:
+                Initialises a new search on the given grid.
+            neighbours(node: int) -> list:
+                Returns the walkable neighbours of a cell.
+            heuristic(node: int) -> float:
+                Returns the estimated cost from a cell to the finish cell.
+            steps(start: int, finish: int, events: bool=True) -> Iterator:
+                Runs the search one step at a time, yielding (event, node) tuples.
+            run(start: int, finish: int) -> SearchResult:
+                Runs the whole search from the start cell to the finish cell.
+            stop() -> None:
+                Stops the search that is currently running.
+
+    BreadthFirstSearch, AStar, GreedyBFS:
+        The search algorithms (subclasses of Search).
+
+    Dijkstra:
+        A* with a heuristic of zero (a subclass of AStar).
+
+    JumpPointSearch:
+        A* that only expands jump points (a subclass of AStar).
+
+    LifelongAStar:
+        An incremental A* (LPA*) that keeps its search between runs and only repairs it where the grid changed.
+
+    HierarchicalAStar:
+        Hierarchical A* (HPA*), searching a cached abstract graph of the grid's clusters and refining the path.
+
+    BidirectionalSearch:
+        The base class for searches that run from the start and the finish at the same time.
+
+    BidirectionalBFS, BidirectionalAStar:
+        The bidirectional search algorithms (subclasses of BidirectionalSearch).
+
+Functions:
+    manhattan(d_row: int, d_col: int) -> float:
+    octile(d_row: int, d_col: int) -> float:
+    euclidean(d_row: int, d_col: int) -> float:
+    zero(d_row: int, d_col: int) -> float:
+        The heuristics, estimating the cost between two cells that are d_row rows and d_col columns apart.
+    default_heuristic(grid: Grid) -> str:
+        Returns the name of the heuristic that matches the grid's movement.
+
+Constants:
+    ALGORITHMS (dict): Maps a short name for each algorithm to its class (used by the headless tools).
+    HEURISTICS (dict): Maps the name of each heuristic to its function.
+
+Step events:
+    Search.steps yields (event, node) tuples, where event is one of:
+        'queued': the node has been added to the open set
+        'visited': the node has been expanded
+        'found': the finish node has been reached (sent once, before any 'path' events)
+        'path': the node is part of the final path (sent from the finish back to the start)
+"""
+
+import heapq
+import math
+import time
+from array import array
+from collections import deque
+from typing import Iterator
+
+import numpy as np
+
+# import necessary project files
+from grid import Grid, State
+
+# the bits of a cell's neighbour mask (see grid.DIRECTIONS) that are set if the cell above/below/left/right can be
+# walked onto, and the bits for the diagonal neighbours (only set on an 8-connected grid)
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = 16, 32, 64, 128
+
+# the length of a diagonal move
+SQRT2 = math.sqrt(2)
+
+# plain int copy of State.BARRIER, so a cell's state can be checked without going through the enum
+BARRIER = int(State.BARRIER)
+
+
+def manhattan(d_row: int, d_col: int) -> float:
+    """ The number of moves between two cells on a 4-connected grid """
+
+    return d_row + d_col
+
+
+def octile(d_row: int, d_col: int) -> float:
+    """ The cost between two cells on an 8-connected grid (diagonal moves cost sqrt(2)) """
+
+    return max(d_row, d_col) + (math.sqrt(2) - 1) * min(d_row, d_col)
+
+
+def euclidean(d_row: int, d_col: int) -> float:
+    """ The straight line distance between two cells """
+
+    return math.sqrt(d_row * d_row + d_col * d_col)
+
+
+def zero(d_row: int, d_col: int) -> float:
+    """ No estimate at all (A* then expands cells in the same order as Dijkstra's algorithm) """
+
+    return 0
+
+
+HEURISTICS = {
+    'manhattan': manhattan,
+    'octile': octile,
+    'euclidean': euclidean,
+    'zero': zero
+}
+
+
+def default_heuristic(grid: Grid) -> str:
+    """ Returns the name of the heuristic that matches the grid's movement (octile if it is 8-connected) """
+
+    return 'octile' if grid.connectivity == 8 else 'manhattan'
+
+
+class SearchResult:
+    """
+    Stores the outcome of a search.
+
+    Attributes:
+        name (str): The name of the algorithm that produced the result.
+        path (list): The cells on the path from the start to the finish (empty if no path was found).
+        nodes_searched (int): The number of nodes the algorithm searched.
+        elapsed_time (float): The time taken by the search in seconds (excluding time spent between steps).
+        path_cost (float): The sum of the movement costs of the cells on the path after the start, with diagonal
+            moves costing sqrt(2) times as much (the same as path_length on an unweighted, 4-connected grid).
+    """
+
+    def __init__(self, name: str, path: list, nodes_searched: int, elapsed_time: float,
+                 path_cost: float=None) -> None:
+
+        self.name = name
+        self.path = path
+        self.nodes_searched = nodes_searched
+        self.elapsed_time = elapsed_time
+        self.path_cost = self.path_length if path_cost is None else path_cost
+
+    @property
+    def is_found(self) -> bool:
+        return len(self.path) > 0
+
+    @property
+    def path_length(self) -> int:
+        """ The number of steps on the path (0 if no path was found) """
+
+        return max(len(self.path) - 1, 0)
+
+    def summary(self) -> str:
+        """ Returns the analysis message printed by the visualisation """
+
+        if not self.is_found:
+            return "path not found"
+
+        cost = f", path cost = {round(self.path_cost, 2)}" if self.path_cost != self.path_length else ""
+        return f"[{self.name:^10}] visited {self.nodes_searched} nodes, path length = {self.path_length}{cost}," \
+            f" time taken = {round(self.elapsed_time, 3)}s"
+
+
+class Search:
+    """
+    The base class for all of the search algorithms.
+
+    Subclasses implement the open set by overriding reset_open(), push(), pop() and has_open().
+
+    Instead of clearing arrays the size of the grid before every search, each search run gets a new generation
+    number. A cell is marked with the generation (OPEN) when it is first reached and with the generation + 1
+    (CLOSED) once it has been expanded, so any cell with a mark below the generation has not been reached by the
+    current search, and its costs and prior cell are left over from an older one. Starting a search therefore
+    costs the same however big the grid is, as long as the same Search object is reused.
+
+    Heuristics are only worked out for the cells a search reaches, when it reaches them, using the function
+    named by the heuristic argument (a key of HEURISTICS), multiplied by the grid's lowest movement cost. If no
+    heuristic is named, the octile distance is used on an 8-connected grid and the Manhattan distance otherwise
+    (picked when each search starts, so it follows the grid if its connectivity changes). Searches that don't use
+    a heuristic ignore it.
+
+    The prior cells and costs are written into the grid's arrays, so the visualisation can show them. A private
+    search keeps them in arrays of its own instead, so it never changes the grid (see batch.py).
+
+    Attributes:
+        grid (Grid): the grid on which the search is run.
+        result (SearchResult): the result of the last search (None until a search has finished).
+        distance (Callable): The heuristic function, taking the row and column distances between two cells.
+        marks (array): The generation each cell was last reached (or expanded) in.
+        generation (int): The generation of the current search (cells marked generation + 1 have been expanded).
+        min_cost (int): The grid's lowest movement cost when the current search started (the heuristic's scale).
+    """
+
+    name = "search"
+
+    # whether the search keeps what it found between runs, so running it again on an unchanged grid is cheaper
+    keeps_state = False
+
+    def __init__(self, grid: Grid, heuristic: str=None, private: bool=False) -> None:
+
+        self.grid = grid
+        self.rows, self.cols, self.size = grid.rows, grid.cols, grid.size
+        self.heuristic_name = heuristic
+        self.distance = HEURISTICS[heuristic or default_heuristic(grid)]
+        self.private = private
+        self.is_running = False
+        self.result = None
+
+        # initialise attributes used in the pathfinding algorithm (memoryviews of the grid's arrays are used
+        # because indexing them returns plain Python numbers, which is much faster than indexing NumPy arrays)
+        self.state = grid.state.data
+        if private:
+            self.prior = array('i', [-1]) * self.size
+            self.g_cost = array('f', [float('inf')]) * self.size
+            self.h_cost = array('f', [float('inf')]) * self.size
+        else:
+            self.prior = grid.parent.data
+            self.g_cost = grid.g_cost.data
+            self.h_cost = grid.h_cost.data
+        self.links = grid.links.data
+        self.offsets = grid.offsets
+        self.moves = grid.moves
+        self.cost = grid.cost.data
+        self.marks = array('I', [0]) * self.size
+        self.generation = 0
+        self.start = None
+        self.finish = None
+        self.min_cost = 1
+
+        # initialise useful data to help with analysis
+        self.nodes_searched = 0
+
+    def neighbours(self, node: int) -> list:
+        """ Returns the walkable neighbours of a cell (up, down, left, right, then the diagonal ones) """
+
+        # the cell's neighbour mask picks out the offsets to its walkable neighbours (see grid.Grid.links)
+        return [node + offset for offset in self.offsets[self.links[node]]]
+
+    def heuristic(self, node: int) -> float:
+        """ Returns the estimated cost from a cell to the finish cell """
+
+        row, col = divmod(node, self.cols)
+        return self.distance(abs(row - self.finish_row), abs(col - self.finish_col)) * self.min_cost
+
+    def move_cost(self, node: int) -> float:
+        """ Returns the cost of moving onto a cell (see grid.Grid.cost) """
+
+        return self.cost[node]
+
+    def next_generation(self) -> None:
+        """ Starts a new generation of marks, so every cell counts as not reached yet """
+
+        # the marks only have to be cleared if the generation number would no longer fit in them
+        if self.generation >= 0xFFFFFFFF - 2:
+            self.marks = array('I', [0]) * self.size
+            self.generation = 0
+
+        self.generation += 2
+
+    def stop(self) -> None:
+        """ Stops the search that is currently running """
+
+        self.is_running = False
+
+    def reset_open(self, start: int) -> None:
+        raise NotImplementedError
+
+    def has_open(self) -> bool:
+        raise NotImplementedError
+
+    def pop(self) -> int:
+        """ Removes and returns the next node to expand (None if only stale entries were left) """
+
+        raise NotImplementedError
+
+    def push(self, node: int, parent: int) -> None:
+        raise NotImplementedError
+
+    def check_neighbours(self, node: int) -> list:
+        """ Adds any neighbours that have not been reached yet to the open set and returns them """
+
+        queued = []
+        marks, generation = self.marks, self.generation
+
+        for neighbour in self.neighbours(node):
+            if marks[neighbour] < generation:
+                marks[neighbour] = generation
+                self.prior[neighbour] = node
+                self.push(neighbour, node)
+                queued.append(neighbour)
+
+        return queued
+
+    def steps(self, start: int, finish: int, events: bool=True) -> Iterator:
+        """
+        Runs the search one step at a time, yielding (event, node) tuples (see the module docstring).
+
+        The search only advances while the caller keeps pulling events, so it can be paused or abandoned at any
+        point. Once the search has finished, self.result holds the SearchResult; its elapsed_time only counts
+        the time spent searching, not the time the caller spent between steps.
+
+        Args:
+            start (int): The index of the starting cell.
+            finish (int): The index of the finishing cell.
+            events (bool): If False, no events are yielded and the whole search runs on the first next() call.
+        """
+
+        self.reset(start, finish)
+        self.next_generation()
+        self.marks[start] = self.generation
+        self.reset_open(start)
+
+        path = []
+
+        # ensures that the loop only runs if there are still nodes to explore
+        while self.has_open() and self.is_running:
+
+            self.nodes_searched += 1
+
+            curr_node = self.pop()
+            if curr_node is None:
+                break
+            if curr_node == finish:
+                path = self.backtrack(start, finish)
+                break
+
+            queued = self.check_neighbours(curr_node)
+
+            if events:
+                yield from self.step_events(queued, curr_node)
+
+        yield from self.report(path, events)
+
+    def reset(self, start: int, finish: int) -> None:
+        """ Initialises the variables shared by every search before it starts """
+
+        self.start, self.finish = start, finish
+        self.start_row, self.start_col = self.grid.position(start)
+        self.finish_row, self.finish_col = self.grid.position(finish)
+        self.min_cost = self.grid.min_cost()
+        self.distance = HEURISTICS[self.heuristic_name or default_heuristic(self.grid)]
+        self.nodes_searched = 1
+        self.is_running = True
+        self.result = None
+
+        # the search is timed from here, leaving out the time the caller spends between steps (see step_events)
+        self.elapsed_time = 0.0
+        self.step_start = time.perf_counter()
+
+    def step_events(self, queued: list, node: int) -> Iterator:
+        """ Passes an expanded cell and the cells it queued to the caller, keeping the time until the caller asks
+        for the next step out of the timing """
+
+        self.elapsed_time += time.perf_counter() - self.step_start
+        for queued_node in queued:
+            yield 'queued', queued_node
+        yield 'visited', node
+        self.step_start = time.perf_counter()
+
+    def report(self, path: list, events: bool=True) -> Iterator:
+        """ Stores the result once the search has finished and yields the 'found' and 'path' events """
+
+        self.elapsed_time += time.perf_counter() - self.step_start
+        self.is_running = False
+        path_cost = self.path_cost(path) if self.grid.weighted_count or self.grid.connectivity == 8 else None
+        self.result = SearchResult(self.name, path, self.nodes_searched, self.elapsed_time, path_cost)
+
+        # send the path once the search has been timed
+        if path and events:
+            yield 'found', path[-1]
+            for node in reversed(path[1:-1]):
+                yield 'path', node
+
+    def run(self, start: int, finish: int) -> SearchResult:
+        """
+        Runs the whole search from the start cell to the finish cell.
+
+        Args:
+            start (int): The index of the starting cell.
+            finish (int): The index of the finishing cell.
+
+        Returns:
+            SearchResult: The path found (if any) and the analysis data.
+        """
+
+        for _ in self.steps(start, finish, events=False):
+            pass
+
+        return self.result
+
+    def path_cost(self, path: list) -> float:
+        """ Returns the cost of following a path (the movement cost of each cell after the start, times sqrt(2)
+        for the cells reached diagonally) """
+
+        cols, cost = self.cols, self.cost
+        return sum(cost[node] * (SQRT2 if prior // cols != node // cols and prior % cols != node % cols else 1)
+                   for prior, node in zip(path, path[1:]))
+
+    def backtrack(self, start: int, finish: int) -> list:
+        """ Follows the prior cells from the finish back to the start and returns the path (start first) """
+
+        path = [finish]
+        curr_node = finish
+
+        while curr_node != start:
+            curr_node = self.prior[curr_node]
+            path.append(curr_node)
+
+        path.reverse()
+        return path
+
+
+class BreadthFirstSearch(Search):
+    """ A breadth-first search (explores the open set in the order cells were queued, ignoring movement costs) """
+
+    name = "BFS"
+
+    def reset_open(self, start: int) -> None:
+        self.open = deque([start])
+
+    def has_open(self) -> bool:
+        return len(self.open) > 0
+
+    def pop(self) -> int:
+        return self.open.popleft()
+
+    def push(self, node: int, parent: int) -> None:
+        self.open.append(node)
+
+
+class AStar(Search):
+    """
+    The A* algorithm, using the search's heuristic to the finish cell (by default the octile distance on an
+    8-connected grid and the Manhattan distance otherwise).
+
+    The open set is a binary heap of (f_cost, g_cost, order, node) entries, so the cell with the lowest f_cost
+    is expanded first, ties are broken by the lowest g_cost and then by the order the cells were queued in.
+    When a cell's g_cost improves a new entry is pushed and the old one is skipped when it is popped.
+    """
+
+    name = "A*"
+
+    def reset_open(self, start: int) -> None:
+        self.g_cost[start] = 0
+        self.order = 0
+        self.h_cost[start] = self.heuristic(start)
+        self.open = [(self.h_cost[start], 0, self.order, start)]
+
+    def has_open(self) -> bool:
+        return len(self.open) > 0
+
+    def pop(self) -> int:
+        """ Removes and returns the cell with the lowest f_cost (ties are broken by the lowest g_cost) """
+
+        closed = self.generation + 1
+
+        while self.open:
+            _, g_cost, _, node = heapq.heappop(self.open)
+
+            # skip entries for cells that have been expanded or reached more cheaply since they were pushed
+            if self.marks[node] == closed or g_cost > self.g_cost[node]:
+                continue
+
+            self.marks[node] = closed
+            return node
+
+        return None
+
+    def push(self, node: int, parent: int) -> None:
+        g_cost, h_cost = self.g_cost[node], self.heuristic(node)
+        self.h_cost[node] = h_cost
+        self.order += 1
+        heapq.heappush(self.open, (g_cost + h_cost, g_cost, self.order, node))
+
+    def check_neighbours(self, node: int) -> list:
+        """ Adds any new neighbours to the open set, updates the costs of neighbours that can be reached more cheaply
+        and returns the neighbours that were queued """
+
+        queued = []
+        marks, generation, cost = self.marks, self.generation, self.cost
+        node_cost = self.g_cost[node]
+
+        for offset, length in self.moves[self.links[node]]:
+            neighbour = node + offset
+            g_cost = node_cost + cost[neighbour] * length
+            mark = marks[neighbour]
+
+            # a cell's g_cost is only used if it was reached by this search (and it isn't changed once expanded)
+            if mark < generation or (mark == generation and g_cost < self.g_cost[neighbour]):
+                marks[neighbour] = generation
+                self.g_cost[neighbour] = g_cost
+                self.prior[neighbour] = node
+                self.push(neighbour, node)
+                queued.append(neighbour)
+
+        return queued
+
+
+class Dijkstra(AStar):
+    """
+    Dijkstra's algorithm using the cost of moving onto each cell (see Search.move_cost).
+
+    This is AStar with a heuristic of zero, so the open set is ordered by g_cost alone. On an unweighted grid this
+    finds paths of the same length as BreadthFirstSearch, but it is slower, since every cell goes through the heap.
+    """
+
+    name = "Dijkstra"
+
+    def heuristic(self, node: int) -> float:
+        return 0
+
+
+class JumpPointSearch(AStar):
+    """
+    Jump Point Search: A* on a uniform-cost grid that only queues the cells where the path might have to turn.
+
+    Instead of queueing every neighbour, each direction is scanned in a straight line until a jump point is
+    reached: the finish cell, or a cell next to a barrier that opens up a turn the scan could not skip. Only
+    jump points are queued and expanded, so open areas are crossed without touching the heap. Vertical scans
+    also stop wherever a horizontal scan from them would reach a jump point, which keeps the paths shortest on
+    a 4-connected grid. The cells between jump points are filled back in when the path is followed back.
+
+    On an 8-connected grid where diagonal moves can't cut corners (see grid.CORNER_RULES), the cells are also
+    scanned diagonally. A diagonal scan stops wherever a horizontal or vertical scan from it would reach a jump
+    point, so the straight scans no longer have to look for turns themselves.
+
+    The scans aren't walked a cell at a time. Apart from the finish, where a scan stops only depends on the
+    grid, so for every direction the last cell a scan can reach and the first cell it would stop at are worked
+    out for the whole grid at once with NumPy (as in JPS+), and a scan is a couple of lookups plus a check for
+    the finish. The tables are kept between searches and built again once the grid has been edited
+    (grid.Grid.changes).
+
+    Jumping relies on every move costing the same, and the diagonal pruning on diagonal moves never cutting
+    corners, so on a weighted grid (see grid.Grid.weighted_count) or with the other corner rules every neighbour
+    is expanded, as in AStar.
+    """
+
+    name = "JPS"
+    keeps_state = True
+
+    # the neighbour mask bit of each (row, col) direction
+    direction_bits = {(-1, 0): UP, (1, 0): DOWN, (0, -1): LEFT, (0, 1): RIGHT,
+                      (-1, -1): UP_LEFT, (-1, 1): UP_RIGHT, (1, -1): DOWN_LEFT, (1, 1): DOWN_RIGHT}
+
+    def __init__(self, grid: Grid, heuristic: str=None, private: bool=False) -> None:
+
+        super().__init__(grid, heuristic, private)
+
+        # the jump tables (direction -> (neighbour mask bit, flat step, the flat index of the last cell a scan
+        # reaches, the flat index of the first cell it stops at or -1), indexed by the cell the scan's first step
+        # lands on) and the grid they were built for
+        self.tables = {}
+        self.tables_key = None
+
+    def reset(self, start: int, finish: int) -> None:
+
+        super().reset(start, finish)
+
+        grid = self.grid
+        self.diagonal = grid.connectivity == 8
+        self.expand_all = grid.weighted_count > 0 or (self.diagonal and grid.corner_cutting != 'never')
+
+        if not self.expand_all and self.tables_key != (grid.relinks, len(grid.changes), grid.connectivity):
+            self.build_tables()
+
+    def first_flagged(self, flags: np.ndarray, d_row: int, d_col: int) -> np.ndarray:
+        """ Returns the flat index of the first cell with its flag set, starting from each cell and moving in a
+        (row, col) direction (-1 where there isn't one) """
+
+        rows, cols = self.rows, self.cols
+        forward = d_row * cols + d_col > 0
+
+        # flat indices only grow (or only shrink) along a line, so the first flagged cell is a running min (or max)
+        # of the flagged cells' indices, taken from the far end of the line
+        cells = np.arange(self.size, dtype=np.int32).reshape(rows, cols)
+        first = np.where(flags, cells, self.size if forward else -1)
+
+        if d_row == 0 or d_col == 0:
+            axis = 1 if d_row == 0 else 0
+            if forward:
+                first = np.flip(np.minimum.accumulate(np.flip(first, axis), axis=axis), axis)
+            else:
+                first = np.maximum.accumulate(first, axis=axis)
+        else:
+            # a diagonal line carries on into the next row, shifted by a column
+            here, after = (slice(0, cols - 1), slice(1, cols)) if d_col == 1 else (slice(1, cols), slice(0, cols - 1))
+            for row in (range(rows - 2, -1, -1) if d_row == 1 else range(1, rows)):
+                np.copyto(first[row, here], first[row + d_row, after], where=~flags[row, here])
+
+        first[first == self.size] = -1
+        return first
+
+    def build_tables(self) -> None:
+        """ Works out where a scan in each direction stops (ignoring the finish) for every cell of the grid """
+
+        rows, cols = self.rows, self.cols
+        links = self.grid.links.reshape(rows, cols)
+        padded = np.pad(links, 1)
+        self.tables = {}
+        jumps = {}
+
+        def scan(direction: tuple, stop: np.ndarray) -> None:
+            # the tables for a direction, and whether a straight scan from each cell finds a jump point
+            d_row, d_col = direction
+            bit, step = self.direction_bits[direction], d_row * cols + d_col
+            moves = links & bit > 0
+            ends, stops = self.first_flagged(~moves, d_row, d_col), self.first_flagged(stop, d_row, d_col)
+            self.tables[direction] = (bit, step, ends.ravel().data, stops.ravel().data)
+
+            if not (d_row and d_col):
+                # the scan's first step lands on the next cell along (cells at the edge can't move that way)
+                inside = (slice(max(-d_row, 0), rows - max(d_row, 0)), slice(max(-d_col, 0), cols - max(d_col, 0)))
+                ahead = (slice(max(d_row, 0), rows + min(d_row, 0)), slice(max(d_col, 0), cols + min(d_col, 0)))
+                end, first_stop = np.zeros_like(ends), np.full_like(stops, -1)
+                end[inside], first_stop[inside] = ends[ahead], stops[ahead]
+                before_end = first_stop <= end if step > 0 else first_stop >= end
+                jumps[direction] = moves & (first_stop >= 0) & before_end
+
+        def forced(direction: tuple) -> np.ndarray:
+            # cells beside the line that were blocked behind a cell but can be reached from it
+            d_row, d_col = direction
+            behind = padded[1 - d_row:rows + 1 - d_row, 1 - d_col:cols + 1 - d_col]
+            sides = (UP, DOWN) if d_row == 0 else (LEFT, RIGHT)
+            return np.logical_or.reduce([(links & side > 0) & (behind & side == 0) for side in sides])
+
+        for direction in ((0, -1), (0, 1)):
+            scan(direction, forced(direction))
+
+        for direction in ((-1, 0), (1, 0)):
+            stop = forced(direction)
+            if not self.diagonal:
+                # stop wherever the path might turn off to a jump point further along the row
+                stop = stop | ((links & LEFT > 0) & jumps[(0, -1)]) | ((links & RIGHT > 0) & jumps[(0, 1)])
+            scan(direction, stop)
+
+        if self.diagonal:
+            for d_row in (-1, 1):
+                for d_col in (-1, 1):
+                    # stop wherever the path might carry on horizontally or vertically to a jump point
+                    stop = ((links & self.direction_bits[(0, d_col)] > 0) & jumps[(0, d_col)]) | \
+                        ((links & self.direction_bits[(d_row, 0)] > 0) & jumps[(d_row, 0)])
+                    scan((d_row, d_col), stop)
+
+        self.tables_key = (self.grid.relinks, len(self.grid.changes), self.grid.connectivity)
+
+    def reach(self, node: int, direction: tuple) -> int:
+        """ Returns the number of cells a scan from a cell can move in a direction (before it is blocked) """
+
+        bit, step, ends, _ = self.tables[direction]
+        return (ends[node + step] - node) // step if self.links[node] & bit else 0
+
+    def finish_steps(self, node: int, direction: tuple, limit: int) -> int:
+        """ Returns how many steps a scan from a cell takes before the finish makes it stop (None if it doesn't
+        within limit steps): on the finish itself, or where a scan turning off towards the finish would reach it """
+
+        cols = self.cols
+        d_row, d_col = direction
+        row, col = divmod(node, cols)
+        row_steps, col_steps = (self.finish_row - row) * d_row, (self.finish_col - col) * d_col
+        steps = []
+
+        if d_row == 0:
+            # the finish is further along the row
+            if row == self.finish_row and col_steps > 0:
+                steps.append(col_steps)
+
+        elif d_col == 0:
+            if col == self.finish_col:
+                steps.append(row_steps)
+            elif not self.diagonal:
+                # a vertical scan on a 4-connected grid stops where the finish can be reached along the row
+                d_finish_col = self.finish_col - col
+                turn = (0, 1 if d_finish_col > 0 else -1)
+                if row_steps <= limit and self.reach(node + row_steps * d_row * cols, turn) >= abs(d_finish_col):
+                    steps.append(row_steps)
+
+        else:
+            # a diagonal scan stops where the finish can be reached horizontally or vertically
+            step = d_row * cols + d_col
+            if col_steps >= row_steps and row_steps <= limit and \
+                    self.reach(node + row_steps * step, (0, d_col)) >= col_steps - row_steps:
+                steps.append(row_steps)
+            if row_steps >= col_steps and col_steps <= limit and \
+                    self.reach(node + col_steps * step, (d_row, 0)) >= row_steps - col_steps:
+                steps.append(col_steps)
+
+        steps = [count for count in steps if count <= limit]
+        return min(steps) if steps else None
+
+    def jump(self, node: int, direction: tuple) -> int:
+        """ Scans from a cell in a (row, col) direction and returns how many steps away the first jump point is (None
+        if there isn't one) """
+
+        bit, step, ends, stops = self.tables[direction]
+        if not self.links[node] & bit:
+            return None
+
+        # the number of cells the scan can move, and how far it gets before the grid makes it stop
+        reach = (ends[node + step] - node) // step
+        stop = stops[node + step]
+        steps = (stop - node) // step if stop >= 0 else reach + 1
+        limit = steps - 1 if steps <= reach else reach
+
+        # the finish can only stop the scan sooner if it is ahead of the cell, within the steps the scan takes
+        d_row, d_col = direction
+        row, col = divmod(node, self.cols)
+        row_steps, col_steps = (self.finish_row - row) * d_row, (self.finish_col - col) * d_col
+        if d_row == 0:
+            near = row == self.finish_row and 0 < col_steps <= limit
+        elif d_col == 0:
+            near = 0 < row_steps <= limit
+        else:
+            near = 0 < row_steps and 0 < col_steps and min(row_steps, col_steps) <= limit
+
+        if near:
+            finish_steps = self.finish_steps(node, direction, limit)
+            if finish_steps is not None:
+                steps = finish_steps
+
+        return steps if steps <= reach else None
+
+    def directions(self, node: int) -> list:
+        """ Returns the (row, col) directions to jump in from a cell (every direction for the start, otherwise
+        pruned by the direction the cell was reached from) """
+
+        if node == self.start:
+            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            if self.diagonal:
+                directions += [(d_row, d_col) for d_row in (-1, 1) for d_col in (-1, 1)]
+            return directions
+
+        cols = self.cols
+        row, col = divmod(node, cols)
+        parent_row, parent_col = divmod(self.prior[node], cols)
+        d_row, d_col = (row > parent_row) - (row < parent_row), (col > parent_col) - (col < parent_col)
+
+        if d_row and d_col:
+            # moving diagonally: carry on, or carry on horizontally or vertically
+            return [(d_row, d_col), (0, d_col), (d_row, 0)]
+
+        if d_col:
+            # moving horizontally: carry on, or turn up or down (or diagonally up or down, on an 8-connected grid)
+            directions = [(0, d_col), (-1, 0), (1, 0)]
+            if self.diagonal:
+                directions += [(-1, d_col), (1, d_col)]
+            return directions
+
+        # moving vertically: carry on, or turn left or right (the vertical scan stopped here because of a turn)
+        directions = [(d_row, 0), (0, -1), (0, 1)]
+        if self.diagonal:
+            directions += [(d_row, -1), (d_row, 1)]
+        return directions
+
+    def check_neighbours(self, node: int) -> list:
+        """ Adds the jump points reachable from a cell to the open set (or updates their costs) and returns the
+        jump points that were queued """
+
+        if self.expand_all:
+            return super().check_neighbours(node)
+
+        queued = []
+        cols, marks, generation = self.cols, self.marks, self.generation
+        node_cost = self.g_cost[node]
+
+        for d_row, d_col in self.directions(node):
+            steps = self.jump(node, (d_row, d_col))
+            if steps is None:
+                continue
+
+            # jump points are in a straight (or diagonal) line from the cell, so the cost is the distance between them
+            jump_point = node + steps * (d_row * cols + d_col)
+            g_cost = node_cost + (steps * SQRT2 if d_row and d_col else steps)
+            mark = marks[jump_point]
+
+            if mark < generation or (mark == generation and g_cost < self.g_cost[jump_point]):
+                marks[jump_point] = generation
+                self.g_cost[jump_point] = g_cost
+                self.prior[jump_point] = node
+                self.push(jump_point, node)
+                queued.append(jump_point)
+
+        return queued
+
+    def backtrack(self, start: int, finish: int) -> list:
+        """ Follows the jump points back from the finish to the start, filling in (and setting the prior cells of)
+        the cells in between, and returns the whole path (start first) """
+
+        cols = self.cols
+        path = [finish]
+        curr_node = finish
+
+        while curr_node != start:
+            jump_point = self.prior[curr_node]
+
+            # the step from the previous jump point towards this one
+            row, col = divmod(curr_node, cols)
+            jump_row, jump_col = divmod(jump_point, cols)
+            step = ((row > jump_row) - (row < jump_row)) * cols + (col > jump_col) - (col < jump_col)
+
+            while curr_node != jump_point:
+                self.prior[curr_node] = curr_node - step
+                curr_node -= step
+                path.append(curr_node)
+
+        path.reverse()
+        return path
+
+
+class GreedyBFS(Search):
+    """
+    The greedy best-first search, always expanding the cell closest to the finish cell.
+
+    The open set is a binary heap of (h_cost, order, node) entries, so ties are broken by the order the cells
+    were queued in. Cells are only queued the first time they are seen, and any entry for a cell that has
+    already been expanded is skipped when it is popped.
+    """
+
+    name = "Greedy BFS"
+
+    def reset_open(self, start: int) -> None:
+        self.order = 0
+        self.open = [(self.heuristic(start), self.order, start)]
+
+    def has_open(self) -> bool:
+        return len(self.open) > 0
+
+    def pop(self) -> int:
+        """ Removes and returns the cell with the lowest h_cost """
+
+        closed = self.generation + 1
+
+        while self.open:
+            node = heapq.heappop(self.open)[2]
+            if self.marks[node] != closed:
+                self.marks[node] = closed
+                return node
+
+        return None
+
+    def push(self, node: int, parent: int) -> None:
+        self.order += 1
+        heapq.heappush(self.open, (self.heuristic(node), self.order, node))
+
+
+class BidirectionalSearch(Search):
+    """
+    The base class for searches that run from the start and the finish at the same time.
+
+    The forward search stores its costs and prior cells in the usual arrays (see Search), and the backward
+    search stores its costs and next cells (towards the finish) in arrays of its own. Whenever one search reaches a cell the
+    other search has reached, the cost of the path through that cell is compared with the best one so far.
+    Once the searches are done, the path is stitched together at the best meeting cell, and the prior cells of
+    the backward half are written into the grid so the whole path can be followed back from the finish.
+    The backward search has its own marks (see Search), which share the forward search's generation.
+    """
+
+    def __init__(self, grid: Grid, heuristic: str=None, private: bool=False) -> None:
+
+        super().__init__(grid, heuristic, private)
+
+        self.g_cost_back = array('f', [float('inf')]) * self.size
+        self.successor = array('i', [-1]) * self.size
+        self.marks_back = None
+
+    def next_generation(self) -> None:
+
+        super().next_generation()
+
+        # the backward marks are cleared whenever the forward ones are (including before the first search)
+        if self.generation == 2:
+            self.marks_back = array('I', [0]) * self.size
+
+    def reset_sides(self, start: int, finish: int) -> None:
+        """ Initialises the costs and marks of both searches """
+
+        self.next_generation()
+        self.g_cost[start] = 0
+        self.g_cost_back[finish] = 0
+        self.marks[start] = self.generation
+        self.marks_back[finish] = self.generation
+
+        # the best meeting cell found so far and the cost of the path through it
+        self.meet = start if start == finish else None
+        self.best_cost = 0 if start == finish else float('inf')
+
+    def check_meet(self, node: int, g_cost: float, g_cost_other: float) -> None:
+        """ Records a cell reached by both searches if the path through it is the best one so far """
+
+        if g_cost + g_cost_other < self.best_cost:
+            self.best_cost = g_cost + g_cost_other
+            self.meet = node
+
+    def stitch(self, meet: int) -> list:
+        """ Joins the forward path to the meeting cell with the backward path from it and returns the whole path """
+
+        path = self.backtrack(self.start, meet)
+        curr_node = meet
+
+        while curr_node != self.finish:
+            next_node = self.successor[curr_node]
+            self.prior[next_node] = curr_node
+            path.append(next_node)
+            curr_node = next_node
+
+        return path
+
+
+class BidirectionalBFS(BidirectionalSearch):
+    """
+    A breadth-first search run from both the start and the finish (ignoring movement costs).
+
+    Each step expands a whole layer of whichever search has the smaller frontier. Once the searches meet, the
+    rest of that layer is still expanded, since a later cell in the layer can give a shorter path.
+    """
+
+    name = "Bi-BFS"
+
+    def steps(self, start: int, finish: int, events: bool=True) -> Iterator:
+
+        self.reset(start, finish)
+        self.reset_sides(start, finish)
+
+        frontiers = [[start], [finish]]
+        costs = [self.g_cost, self.g_cost_back]
+        priors = [self.prior, self.successor]
+        marks, generation = [self.marks, self.marks_back], self.generation
+
+        while self.meet is None and frontiers[0] and frontiers[1] and self.is_running:
+
+            # expand the next layer of the search with the smaller frontier
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            g_cost, g_cost_other, prior = costs[side], costs[1 - side], priors[side]
+            side_marks, other_marks = marks[side], marks[1 - side]
+            layer = []
+
+            for curr_node in frontiers[side]:
+
+                self.nodes_searched += 1
+                queued = []
+                new_cost = g_cost[curr_node] + 1
+
+                for neighbour in self.neighbours(curr_node):
+                    if side_marks[neighbour] < generation:
+                        side_marks[neighbour] = generation
+                        g_cost[neighbour] = new_cost
+                        prior[neighbour] = curr_node
+                        layer.append(neighbour)
+                        queued.append(neighbour)
+
+                        if other_marks[neighbour] >= generation:
+                            self.check_meet(neighbour, new_cost, g_cost_other[neighbour])
+
+                if events:
+                    yield from self.step_events(queued, curr_node)
+
+            frontiers[side] = layer
+
+        path = self.stitch(self.meet) if self.meet is not None and self.is_running else []
+
+        yield from self.report(path, events)
+
+
+class BidirectionalAStar(BidirectionalSearch):
+    """
+    The A* algorithm run from both the start and the finish, each using the heuristic towards the other.
+
+    The forward search adds the cost of the cell it moves onto and the backward search the cost of the cell it
+    moves from, so both count the cost of moving along the path towards the finish.
+
+    Each step expands a cell from whichever search has the smaller open set. The search stops once the lowest
+    f_cost in either open set is at least the cost of the best path found through a meeting cell, since
+    neither search can then find a cheaper path.
+    """
+
+    name = "Bi-A*"
+
+    def h_cost_back(self, node: int) -> float:
+        """ Returns the estimated cost from a cell to the start cell """
+
+        row, col = divmod(node, self.cols)
+        return self.distance(abs(row - self.start_row), abs(col - self.start_col)) * self.min_cost
+
+    def steps(self, start: int, finish: int, events: bool=True) -> Iterator:
+
+        self.reset(start, finish)
+        self.reset_sides(start, finish)
+
+        costs = [self.g_cost, self.g_cost_back]
+        priors = [self.prior, self.successor]
+        heuristics = [self.heuristic, self.h_cost_back]
+        marks, generation, closed = [self.marks, self.marks_back], self.generation, self.generation + 1
+        opens = [[(self.heuristic(start), 0, 0, start)], [(self.h_cost_back(finish), 0, 0, finish)]]
+        cost = self.cost
+        order = 0
+
+        while self.is_running:
+
+            # skip entries for cells that have been expanded or reached more cheaply since they were pushed
+            for side in (0, 1):
+                open_set = opens[side]
+                while open_set and (marks[side][open_set[0][3]] == closed or open_set[0][1] > costs[side][open_set[0][3]]):
+                    heapq.heappop(open_set)
+
+            if not opens[0] or not opens[1]:
+                break
+            if max(opens[0][0][0], opens[1][0][0]) >= self.best_cost:
+                break
+
+            # expand the best cell of the search with the smaller open set
+            side = 0 if len(opens[0]) <= len(opens[1]) else 1
+            g_cost, g_cost_other, prior, heuristic = costs[side], costs[1 - side], priors[side], heuristics[side]
+            side_marks, other_marks = marks[side], marks[1 - side]
+
+            curr_node = heapq.heappop(opens[side])[3]
+            side_marks[curr_node] = closed
+            self.nodes_searched += 1
+
+            queued = []
+            node_cost, curr_cost = g_cost[curr_node], cost[curr_node]
+
+            for offset, length in self.moves[self.links[curr_node]]:
+                neighbour = curr_node + offset
+                new_cost = node_cost + (cost[neighbour] if side == 0 else curr_cost) * length
+                mark = side_marks[neighbour]
+                if mark < generation or (mark == generation and new_cost < g_cost[neighbour]):
+                    side_marks[neighbour] = generation
+                    g_cost[neighbour] = new_cost
+                    prior[neighbour] = curr_node
+                    order += 1
+
+                    # the heap holds the cost as stored (rounded to float32), so the entry isn't skipped as stale
+                    new_cost = g_cost[neighbour]
+                    heapq.heappush(opens[side], (new_cost + heuristic(neighbour), new_cost, order, neighbour))
+                    queued.append(neighbour)
+
+                    if other_marks[neighbour] >= generation:
+                        self.check_meet(neighbour, new_cost, g_cost_other[neighbour])
+
+            if events:
+                yield from self.step_events(queued, curr_node)
+
+        path = self.stitch(self.meet) if self.meet is not None and self.is_running else []
+
+        yield from self.report(path, events)
+
+
+class LifelongAStar(Search):
+    """
+    Lifelong Planning A* (LPA*): an A* that keeps its search between runs and repairs it when the grid changes.
+
+    Each cell has a g_cost (its cost when it was last expanded) and an rhs cost (the lowest g_cost of its
+    neighbours plus the cell's movement cost). A cell whose two costs differ is inconsistent and sits in the open
+    set, ordered by (min(g, rhs) + h, min(g, rhs)). Expanding it makes it consistent again and updates the rhs costs
+    of its neighbours. The first run is an ordinary A*. On later runs with the same start and finish, only the cells
+    whose walkability or cost changed since the last run (grid.Grid.changes) and their neighbours have their rhs
+    costs updated, so the search only has to expand the part of the grid that the edits affected.
+
+    The costs and prior cells are kept in arrays of the search's own (other searches reuse the grid's arrays),
+    and the path is copied into the search's usual prior cells (see Search) when it is followed back. A run that is stopped part way
+    leaves every inconsistent cell in the open set, so the next run carries on from where it stopped.
+
+    Diagonal moves make the costs irrational, and the same cost reached in a different order can differ in its
+    last bits, so the costs are kept in double precision and a cell counts as consistent (and two keys count as
+    equal) when their costs are within COST_TOLERANCE of each other. The path is followed back through the neighbour with the lowest g_cost
+    plus move cost, rather than the prior cells stored when the rhs costs were worked out, which can be stale.
+    """
+
+    name = "LPA*"
+    keeps_state = True
+
+    # the relative difference below which a cell's g_cost and rhs cost count as equal
+    COST_TOLERANCE = 1e-9
+
+    def __init__(self, grid: Grid, heuristic: str=None, private: bool=False) -> None:
+
+        super().__init__(grid, heuristic, private)
+
+        # the search kept between runs (g_cost is None until the first run)
+        self.g_cost = None
+        self.rhs = None
+        self.parent = None
+        self.relinks = None
+        self.change_count = 0
+
+    def restart(self, start: int) -> None:
+        """ Throws away the search kept from the last run and starts a new one from the start cell """
+
+        self.g_cost = array('d', [float('inf')]) * self.size
+        self.rhs = array('d', [float('inf')]) * self.size
+        self.parent = array('i', [-1]) * self.size
+        self.keys = {}
+        self.open = []
+        self.order = 0
+
+        self.rhs[start] = 0
+        self.queue(start)
+
+    def key(self, node: int) -> tuple:
+        cost = min(self.g_cost[node], self.rhs[node])
+        return cost + self.heuristic(node), cost
+
+    def is_consistent(self, node: int) -> bool:
+        """ Returns whether a cell's g_cost and rhs cost are equal (within COST_TOLERANCE) """
+
+        g_cost, rhs = self.g_cost[node], self.rhs[node]
+        return g_cost == rhs or abs(g_cost - rhs) <= self.COST_TOLERANCE * max(1.0, min(g_cost, rhs))
+
+    def is_below(self, key: tuple, other: tuple) -> bool:
+        """ Returns whether a key comes before another one (treating costs within COST_TOLERANCE as equal) """
+
+        tolerance = self.COST_TOLERANCE * max(1.0, min(key[0], other[0]))
+        if abs(key[0] - other[0]) > tolerance:
+            return key[0] < other[0]
+        return key[1] < other[1] - tolerance
+
+    def queue(self, node: int) -> bool:
+        """ Adds a cell to the open set if it is inconsistent (or takes it out if it isn't) and returns whether it was added """
+
+        if self.is_consistent(node):
+            self.keys.pop(node, None)
+            return False
+
+        key = self.key(node)
+        self.keys[node] = key
+        self.order += 1
+        heapq.heappush(self.open, (key[0], key[1], self.order, node))
+        return True
+
+    def top_key(self) -> tuple:
+        """ Returns the key of the next cell to expand (None if the open set is empty) """
+
+        # skip entries for cells that have become consistent or been queued again since they were pushed
+        while self.open:
+            f_cost, cost, _, node = self.open[0]
+            if self.keys.get(node) == (f_cost, cost):
+                return f_cost, cost
+            heapq.heappop(self.open)
+
+        return None
+
+    def update_cell(self, node: int) -> bool:
+        """ Recalculates the rhs cost of a cell from its neighbours and queues it if it is inconsistent """
+
+        if node != self.start:
+            rhs, parent = float('inf'), -1
+
+            # barriers can't be reached, and the neighbour index only contains walkable neighbours
+            if self.state[node] < BARRIER:
+                move_cost = self.cost[node]
+                for offset, length in self.moves[self.links[node]]:
+                    cost = self.g_cost[node + offset] + move_cost * length
+                    if cost < rhs:
+                        rhs, parent = cost, node + offset
+
+            self.rhs[node] = rhs
+            self.parent[node] = parent
+
+        return self.queue(node)
+
+    def steps(self, start: int, finish: int, events: bool=True) -> Iterator:
+
+        # start again if the start/finish cells moved or the whole grid was changed since the last run (or the
+        # lowest movement cost changed, which changes every cell's heuristic)
+        restart = self.g_cost is None or (start, finish) != (self.start, self.finish) or \
+            self.relinks != self.grid.relinks or self.min_cost != self.grid.min_cost()
+
+        self.reset(start, finish)
+
+        if restart:
+            self.restart(start)
+        else:
+            for node in self.grid.changes[self.change_count:]:
+                self.update_cell(node)
+                for neighbour in self.neighbours(node):
+                    self.update_cell(neighbour)
+
+        self.relinks, self.change_count = self.grid.relinks, len(self.grid.changes)
+        g_cost, rhs = self.g_cost, self.rhs
+
+        # expand cells until the finish cell is consistent and no cell in the open set could give a cheaper path
+        while self.is_running:
+
+            top_key = self.top_key()
+            if top_key is None or (not self.is_below(top_key, self.key(finish)) and self.is_consistent(finish)):
+                break
+
+            curr_node = heapq.heappop(self.open)[3]
+            del self.keys[curr_node]
+            self.nodes_searched += 1
+
+            if g_cost[curr_node] > rhs[curr_node]:
+                g_cost[curr_node] = rhs[curr_node]
+                updated = self.neighbours(curr_node)
+            else:
+                g_cost[curr_node] = float('inf')
+                updated = self.neighbours(curr_node) + [curr_node]
+
+            queued = [node for node in updated if self.update_cell(node)]
+
+            if events:
+                yield from self.step_events(queued, curr_node)
+
+        path = self.backtrack(start, finish) if self.is_running and g_cost[finish] != float('inf') else []
+
+        yield from self.report(path, events)
+
+    def backtrack(self, start: int, finish: int) -> list:
+        """ Follows the cheapest neighbours back from the finish, copying them into the search's prior cells, and
+        returns the path (start first) """
+
+        path = [finish]
+        curr_node = finish
+        visited = {finish}
+
+        while curr_node != start:
+            move_cost = self.cost[curr_node]
+            best_cost, best_node = float('inf'), -1
+            for offset, length in self.moves[self.links[curr_node]]:
+                cost = self.g_cost[curr_node + offset] + move_cost * length
+                if cost < best_cost:
+                    best_cost, best_node = cost, curr_node + offset
+
+            # the g_costs fall along the path, so coming back to a cell means the search's costs are broken
+            if best_node == -1 or best_node in visited:
+                raise RuntimeError(f"LPA* could not follow the path back from cell {curr_node}")
+
+            self.prior[curr_node] = self.parent[curr_node] = best_node
+            curr_node = best_node
+            visited.add(curr_node)
+            path.append(curr_node)
+
+        path.reverse()
+        return path
+
+
+class HierarchicalAStar(Search):
+    """
+    Hierarchical Pathfinding A* (HPA*): A* on an abstract graph of the grid, refined into a path afterwards.
+
+    The grid is split into square clusters. Wherever the cells along the border between two clusters can be
+    walked through on both sides, the run of cells is an entrance, marked by one pair of cells facing each other
+    across the border (two pairs, one at each end, for runs of 6 cells or more). These cells are the nodes of
+    the abstract graph: each is joined to the cell facing it (at that cell's movement cost) and to the other nodes
+    of its cluster (at the cost of the cheapest path between them inside the cluster).
+
+    A query joins the start and finish cells to the nodes of their clusters, searches the abstract graph with
+    A*, and then fills in the path inside each cluster it passes through. The paths are usually a few percent
+    longer than the shortest path, but a long query only has to search the abstract graph plus a cluster or two.
+
+    The entrances and cluster graphs are only worked out when a query first needs them, and then kept between
+    queries. When a cell's walkability or cost changes (grid.Grid.changes), only the cached data of its cluster,
+    and of any cluster sharing a border the cell lies on, is thrown away. The nodes searched are the abstract nodes
+    expanded plus the cells searched to join the start/finish to the graph and to fill in the path.
+
+    Clusters are only joined across their borders by straight moves. On an 8-connected grid a diagonal move
+    across a border can always be replaced by two straight ones, except when diagonal moves can squeeze between
+    two barriers (the 'always' corner rule), so a path that has to squeeze between clusters isn't found.
+    """
+
+    name = "HPA*"
+    keeps_state = True
+    cluster_size = 16
+
+    def __init__(self, grid: Grid, heuristic: str=None, private: bool=False, cluster_size: int=None) -> None:
+
+        super().__init__(grid, heuristic, private)
+
+        if cluster_size is not None:
+            self.cluster_size = cluster_size
+        self.cluster_rows = math.ceil(self.rows / self.cluster_size)
+        self.cluster_cols = math.ceil(self.cols / self.cluster_size)
+
+        # the cluster of every cell, so the local searches can check they haven't left the cluster with one lookup
+        rows, cols = np.indices((self.rows, self.cols)) // self.cluster_size
+        self.cluster_ids = (rows * self.cluster_cols + cols).astype(np.int32).ravel().data
+
+        # the cached entrances ((cluster, cluster) -> list of (cell, cell) pairs facing each other across the
+        # border) and cluster graphs (cluster -> {node: [(node, cost)]})
+        self.borders = {}
+        self.clusters = {}
+
+        # the point in the grid's change log the caches are up to date with
+        self.relinks = None
+        self.change_count = 0
+
+    def cluster_of(self, node: int) -> int:
+        return self.cluster_ids[node]
+
+    def bounds(self, cluster: int) -> tuple:
+        """ Returns the first row, end row, first column and end column of a cluster """
+
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        row, col = cluster_row * self.cluster_size, cluster_col * self.cluster_size
+        return row, min(row + self.cluster_size, self.rows), col, min(col + self.cluster_size, self.cols)
+
+    def adjacent_clusters(self, cluster: int) -> list:
+        """ Returns the clusters above, below, left and right of a cluster """
+
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        adjacent = []
+
+        if cluster_row > 0:
+            adjacent.append(cluster - self.cluster_cols)
+        if cluster_row < self.cluster_rows - 1:
+            adjacent.append(cluster + self.cluster_cols)
+        if cluster_col > 0:
+            adjacent.append(cluster - 1)
+        if cluster_col < self.cluster_cols - 1:
+            adjacent.append(cluster + 1)
+
+        return adjacent
+
+    def border(self, cluster: int, other: int) -> list:
+        """ Returns the (cell, cell) pairs marking the entrances between two adjacent clusters (the first cell of
+        each pair is in the cluster with the lower number) """
+
+        key = (min(cluster, other), max(cluster, other))
+        if key in self.borders:
+            return self.borders[key]
+
+        first, second = key
+        row, end_row, col, end_col = self.bounds(first)
+
+        # the border runs down the right edge of the first cluster (if the second one is in the next column), or
+        # along its bottom edge
+        if second % self.cluster_cols != first % self.cluster_cols:
+            cells, across = range(row * self.cols + end_col - 1, end_row * self.cols, self.cols), RIGHT
+        else:
+            cells, across = range((end_row - 1) * self.cols + col, (end_row - 1) * self.cols + end_col), DOWN
+
+        # split the border into runs of cells that can be walked through on both sides
+        runs, run = [], []
+        for cell in cells:
+            if self.state[cell] < BARRIER and self.links[cell] & across:
+                run.append(cell)
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+
+        offset = self.cols if across == DOWN else 1
+        transitions = []
+        for run in runs:
+            for cell in ([run[0], run[-1]] if len(run) >= 6 else [run[len(run) // 2]]):
+                transitions.append((cell, cell + offset))
+
+        self.borders[key] = transitions
+        return transitions
+
+    def local_search(self, source: int, cluster: int, target: int=None, reverse: bool=False) -> tuple:
+        """ Runs Dijkstra's algorithm from a cell, staying inside its cluster (and stopping at the target, if
+        there is one), and returns the cost and prior cell of every cell it reached (with reverse, the costs are
+        of the paths from each cell to the source, and the prior cells are the next cells towards it) """
+
+        cluster_ids, cost = self.cluster_ids, self.cost
+        distance, prior, closed = {source: 0}, {source: None}, set()
+        frontier = [(0, source)]
+
+        while frontier:
+            node_cost, node = heapq.heappop(frontier)
+            if node in closed:
+                continue
+            closed.add(node)
+            if node == target:
+                break
+
+            for offset, length in self.moves[self.links[node]]:
+                neighbour = node + offset
+                if cluster_ids[neighbour] == cluster:
+                    new_cost = node_cost + cost[node if reverse else neighbour] * length
+                    if new_cost < distance.get(neighbour, float('inf')):
+                        distance[neighbour] = new_cost
+                        prior[neighbour] = node
+                        heapq.heappush(frontier, (new_cost, neighbour))
+
+        return distance, prior
+
+    def cluster_graph(self, cluster: int) -> dict:
+        """ Returns the abstract nodes of a cluster and their edges ({node: [(node, cost)]}), building them if they
+        aren't cached """
+
+        if cluster in self.clusters:
+            return self.clusters[cluster]
+
+        # join each node to the cell facing it across the border
+        edges = {}
+        for other in self.adjacent_clusters(cluster):
+            for first, second in self.border(cluster, other):
+                node, facing = (first, second) if cluster < other else (second, first)
+                edges.setdefault(node, []).append((facing, self.cost[facing]))
+
+        # and to the other nodes it can reach inside the cluster
+        for node in edges:
+            distance = self.local_search(node, cluster)[0]
+            edges[node] += [(other, distance[other]) for other in edges if other != node and other in distance]
+
+        self.clusters[cluster] = edges
+        return edges
+
+    def update_caches(self) -> None:
+        """ Throws away the cached entrances and cluster graphs that the edits since the last query could change """
+
+        if self.relinks != self.grid.relinks:
+            self.borders, self.clusters = {}, {}
+        else:
+            for cell in self.grid.changes[self.change_count:]:
+                cluster = self.cluster_of(cell)
+                self.clusters.pop(cluster, None)
+
+                # if the cell is on the edge of its cluster, the entrances across that edge may have changed too
+                row, col = divmod(cell, self.cols)
+                for other in self.adjacent_clusters(cluster):
+                    other_row, end_row, other_col, end_col = self.bounds(other)
+                    if other_row - 1 <= row <= end_row and other_col - 1 <= col <= end_col:
+                        self.borders.pop((min(cluster, other), max(cluster, other)), None)
+                        self.clusters.pop(other, None)
+
+        self.relinks, self.change_count = self.grid.relinks, len(self.grid.changes)
+
+    def steps(self, start: int, finish: int, events: bool=True) -> Iterator:
+
+        self.reset(start, finish)
+
+        self.update_caches()
+        start_cluster, finish_cluster = self.cluster_of(start), self.cluster_of(finish)
+
+        # join the start and finish to the nodes of their clusters (the finish's search is run backwards, so it
+        # finds the cost of walking from each cell to the finish)
+        start_distance, start_prior = self.local_search(start, start_cluster)
+        finish_distance, finish_prior = self.local_search(finish, finish_cluster, reverse=True)
+        self.nodes_searched += len(start_distance) + len(finish_distance)
+
+        start_edges = [(node, start_distance[node]) for node in self.cluster_graph(start_cluster)
+                       if node in start_distance]
+        if finish in start_distance:
+            start_edges.append((finish, start_distance[finish]))
+        finish_edges = {node: finish_distance[node]
+                        for node in self.cluster_graph(finish_cluster) if node in finish_distance}
+
+        # search the abstract graph with A*
+        g_cost, parent, closed = {start: 0}, {start: None}, set()
+        open_set = [(self.heuristic(start), 0, 0, start)]
+        order = 0
+
+        while open_set and self.is_running:
+
+            _, cost, _, curr_node = heapq.heappop(open_set)
+            if curr_node in closed or cost > g_cost[curr_node]:
+                continue
+            closed.add(curr_node)
+
+            if curr_node == finish:
+                break
+            self.nodes_searched += 1
+
+            edges = list(self.cluster_graph(self.cluster_of(curr_node)).get(curr_node, []))
+            if curr_node == start:
+                edges += start_edges
+            if curr_node in finish_edges:
+                edges.append((finish, finish_edges[curr_node]))
+
+            queued = []
+            for neighbour, edge_cost in edges:
+                new_cost = cost + edge_cost
+                if neighbour not in closed and new_cost < g_cost.get(neighbour, float('inf')):
+                    g_cost[neighbour] = new_cost
+                    parent[neighbour] = curr_node
+                    order += 1
+                    heapq.heappush(open_set, (new_cost + self.heuristic(neighbour), new_cost, order, neighbour))
+                    queued.append(neighbour)
+
+            if events:
+                yield from self.step_events(queued, curr_node)
+
+        path = []
+        if finish in closed and self.is_running:
+            path = self.refine(self.abstract_path(parent, finish), start_prior, finish_prior)
+
+        yield from self.report(path, events)
+
+    def abstract_path(self, parent: dict, finish: int) -> list:
+        """ Follows the abstract nodes back from the finish and returns them (start first) """
+
+        nodes = [finish]
+        while parent[nodes[-1]] is not None:
+            nodes.append(parent[nodes[-1]])
+
+        nodes.reverse()
+        return nodes
+
+    def refine(self, nodes: list, start_prior: dict, finish_prior: dict) -> list:
+        """ Fills in the cells between the abstract nodes, sets their prior cells and returns the whole path """
+
+        path = [nodes[0]]
+
+        for node, next_node in zip(nodes, nodes[1:]):
+            cluster = self.cluster_of(node)
+
+            if cluster != self.cluster_of(next_node):
+                # the two cells face each other across a border
+                segment = [next_node]
+
+            elif node == self.start:
+                segment = self.follow(start_prior, next_node)[::-1][1:]
+
+            elif next_node == self.finish:
+                segment = self.follow(finish_prior, node)[1:]
+
+            else:
+                prior = self.local_search(node, cluster, next_node)[1]
+                self.nodes_searched += len(prior)
+                segment = self.follow(prior, next_node)[::-1][1:]
+
+            path += segment
+
+        for prior_node, node in zip(path, path[1:]):
+            self.prior[node] = prior_node
+
+        return path
+
+    def follow(self, prior: dict, node: int) -> list:
+        """ Follows the prior cells of a local search back from a cell to where the search started """
+
+        cells = [node]
+        while prior[cells[-1]] is not None:
+            cells.append(prior[cells[-1]])
+
+        return cells
+
+
+ALGORITHMS = {
+    'bfs': BreadthFirstSearch,
+    'dijkstra': Dijkstra,
+    'astar': AStar,
+    'jps': JumpPointSearch,
+    'lpa-star': LifelongAStar,
+    'hpa-star': HierarchicalAStar,
+    'greedy': GreedyBFS,
+    'bidirectional-bfs': BidirectionalBFS,
+    'bidirectional-astar': BidirectionalAStar
+}
@@ -0,0 +1,364 @@
+"""
+A module containing the compact grid model used by the visualisation and the pathfinding engine.
+
+The grid is stored as flat NumPy arrays (one entry per cell), instead of one Cell object per cell. A cell is
+referred to by its flat index (row * cols + col), and cell.Cell can be used as a view of a single cell.
+Cells store a State rather than a colour; colours are only looked up (from colours.STATE_COLOURS) when drawing.
+The grid keeps track of the start cell, the finish cell and the number of barriers as it is edited, so they
+never have to be found by scanning the grid. It also keeps a neighbour index: for every cell, a bit mask of
+which of its neighbours can be walked onto. A search looks the mask up in a table of flat-index offsets, so it
+never has to check the grid's edges or the neighbours' states itself. Cells whose walkability changes are
+logged in Grid.changes, so searches that keep their state between runs (like engine.LifelongAStar) can repair it.
+Each cell also has a movement cost (the cost of moving onto it, 1 by default), so terrain like mud or roads can
+be modelled; changing a cell's cost is logged in Grid.changes as well.
+
+Movement is 4-connected (up, down, left and right) by default. An 8-connected grid also links each cell to its
+diagonal neighbours, following one of the CORNER_RULES: 'never' (a diagonal move needs both of the cells beside
+it to be walkable, so it can't cut the corner of a barrier), 'one' (it needs at least one of them, so it can't
+squeeze between two barriers) or 'always' (the cells beside it don't matter). A diagonal move is sqrt(2) times as
+long as a straight one, which is recorded in Grid.moves.
+
+Classes:
+    State:
+        The states a cell can be in. Every state below State.BARRIER can be walked through.
+
+    Grid:
+        Stores the state, prior cell and costs of every cell in the grid.
+
+        Methods:
+            __init__(rows: int, cols: int, state: np.ndarray=None, links: np.ndarray=None,
+                     cost: np.ndarray=None, connectivity: int=4, corner_cutting: str='never') -> None:
+                Creates a blank grid (or a grid using existing state/neighbour index/cost arrays).
+            index(row: int, col: int) -> int:
+                Returns the flat index of a cell.
+            position(index: int) -> tuple:
+                Returns the (row, col) of a flat index.
+            set_state(index: int, state: State) -> None:
+                Sets the state of a cell, keeping the start/finish cells, barrier count and neighbour index up to date.
+            set_cost(index: int, cost: int) -> None:
+                Sets the movement cost of a cell, keeping the weighted cell count up to date.
+            min_cost() -> int:
+                Returns the lowest movement cost of any cell.
+            recount(link: bool=True) -> None:
+                Finds the start/finish cells, counts the barriers and weighted cells and rebuilds the neighbour index
+                again after the state/cost arrays were edited directly.
+            set_connectivity(connectivity: int, corner_cutting: str='never') -> None:
+                Switches between 4-connected and 8-connected movement and rebuilds the neighbour index.
+            link() -> None:
+                Rebuilds the neighbour index from the state array.
+            neighbours(index: int) -> list:
+                Returns the indices of the walkable neighbours of a cell.
+            mask(*states: State) -> np.ndarray:
+                Returns a boolean array that is True for every cell in one of the given states.
+            find(state: State) -> int:
+                Returns the index of the first cell in the given state (None if there isn't one).
+            paint(index: int, state: State) -> None:
+                Gives a cell one of the states used to show a search, remembering it so it can be cleared later.
+            clear_search(states: tuple=SEARCH_STATES) -> None:
+                Sets the painted cells that are still in one of the given states back to blank.
+            add_border() -> None:
+                Sets the cells around the edge of the grid to border cells.
+
+Constants:
+    DIRECTIONS (tuple): The (row, col) step to each neighbour, in the order of the bits of a neighbour mask (the
+        first 4 are the straight moves, the last 4 the diagonal ones).
+    CORNER_RULES (tuple): The rules for when a diagonal move can pass the corner of a barrier.
+    SEARCH_STATES (tuple): The states used to show a search (queued, visited and path cells).
+    MAX_COST (int): The highest movement cost a cell can have.
+"""
+
+import numpy as np
+from enum import IntEnum
+
+
+class State(IntEnum):
+    """ The states a cell can be in (every state below BARRIER can be walked through) """
+
+    BLANK = 0
+    START = 1
+    FINISH = 2
+    QUEUED = 3
+    VISITED = 4
+    PATH = 5
+    BARRIER = 6
+    BORDER = 7
+
+
+# the (row, col) step to each neighbour: bit i of a cell's neighbour mask is set if DIRECTIONS[i] can be walked onto
+# (the diagonal bits are only used on an 8-connected grid)
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+CORNER_RULES = ('never', 'one', 'always')
+
+SEARCH_STATES = (State.QUEUED, State.VISITED, State.PATH)
+
+# movement costs are stored as one byte per cell
+MAX_COST = 255
+
+
+class Grid:
+    """
+    Stores the state, prior cell and costs of every cell in the grid as flat NumPy arrays.
+
+    Attributes:
+        rows (int): The number of rows in the grid.
+        cols (int): The number of columns in the grid.
+        size (int): The number of cells in the grid.
+        state (np.ndarray): uint8 array storing each cell's State.
+        parent (np.ndarray): int32 array storing the index of each cell's prior cell on a path (-1 if none).
+        g_cost (np.ndarray): float32 array storing the cost from the start cell to each cell.
+        h_cost (np.ndarray): float32 array storing the estimated cost from each cell to the finish cell.
+        cost (np.ndarray): uint8 array storing the cost of moving onto each cell (1 to MAX_COST, 1 by default).
+        start (int): The index of the start cell (None if it hasn't been placed).
+        finish (int): The index of the finish cell (None if it hasn't been placed).
+        barrier_count (int): The number of barrier cells.
+        weighted_count (int): The number of cells whose movement cost isn't 1 (the grid is unweighted if 0).
+        connectivity (int): 4 if cells are only linked to the cells above, below, left and right of them, or 8 if
+            they are also linked to their diagonal neighbours.
+        corner_cutting (str): When a diagonal move can pass the corner of a barrier (one of CORNER_RULES).
+        links (np.ndarray): uint8 array storing each cell's neighbour mask (bit i is set if the neighbour in
+            DIRECTIONS[i] is inside the grid and can be walked onto).
+        offsets (list): For every neighbour mask, the tuple of flat-index offsets to the neighbours it includes.
+        moves (list): For every neighbour mask, the tuple of (offset, length) pairs of the moves it includes (the
+            length is 1 for a straight move and sqrt(2) for a diagonal one).
+        changes (list): The cells whose walkability (through set_state) or movement cost (through set_cost) has
+            changed since the neighbour index was last rebuilt, oldest first.
+        relinks (int): The number of times the whole neighbour index has been rebuilt (a search that remembers
+            the grid has to start again if this changes, since changes is cleared each time).
+        painted (list): The cells given a search state through paint() since they were last cleared (a cell
+            can appear more than once), so a search can be cleared without scanning the whole grid.
+
+    The start/finish cells, barrier count and neighbour index are only kept up to date when cells are changed
+    through set_state (and the weighted cell count through set_cost); writing START, FINISH, BARRIER or BORDER
+    states straight into the state array, or writing costs into the cost array, must be followed by recount().
+
+    A grid can also be built around an existing state array (and neighbour index and costs), which it uses without
+    copying, for example to share one grid between processes (see batch.run_parallel).
+    """
+
+    def __init__(self, rows: int, cols: int, state: np.ndarray=None, links: np.ndarray=None,
+                 cost: np.ndarray=None, connectivity: int=4, corner_cutting: str='never') -> None:
+
+        self.rows, self.cols = rows, cols
+        self.size = rows * cols
+
+        self.state = np.zeros(self.size, dtype=np.uint8) if state is None else state
+        self.parent = np.full(self.size, -1, dtype=np.int32)
+        self.g_cost = np.full(self.size, np.inf, dtype=np.float32)
+        self.h_cost = np.full(self.size, np.inf, dtype=np.float32)
+        self.cost = np.ones(self.size, dtype=np.uint8) if cost is None else cost
+
+        self.start = None
+        self.finish = None
+        self.barrier_count = 0
+        self.weighted_count = 0
+
+        # initialise the neighbour index (the offsets only depend on the width of the grid)
+        self.check_connectivity(connectivity, corner_cutting)
+        self.connectivity, self.corner_cutting = connectivity, corner_cutting
+        steps = [(row * cols + col, np.sqrt(2) if row and col else 1) for row, col in DIRECTIONS]
+        self.moves = [tuple(move for bit, move in enumerate(steps) if mask >> bit & 1)
+                      for mask in range(1 << len(DIRECTIONS))]
+        self.offsets = [tuple(offset for offset, _ in moves) for moves in self.moves]
+        self.links = np.zeros(self.size, dtype=np.uint8) if links is None else links
+        self.changes = []
+        self.relinks = 0
+        self.painted = []
+
+        if links is None:
+            self.link()
+        if state is not None or cost is not None:
+            self.recount(link=False)
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def position(self, index: int) -> tuple:
+        return divmod(index, self.cols)
+
+    def set_state(self, index: int, state: State) -> None:
+        """ Sets the state of a cell, keeping the start/finish cells, barrier count and neighbour index up to date """
+
+        old_state = self.state[index]
+        if old_state == state:
+            return
+
+        # forget the cell's old state
+        if old_state == State.START:
+            self.start = None
+        elif old_state == State.FINISH:
+            self.finish = None
+        elif old_state == State.BARRIER:
+            self.barrier_count -= 1
+
+        self.state[index] = state
+
+        if state == State.START:
+            self.start = index
+        elif state == State.FINISH:
+            self.finish = index
+        elif state == State.BARRIER:
+            self.barrier_count += 1
+
+        # if the cell became walkable or stopped being walkable, update the masks of the cells around it
+        if (old_state < State.BARRIER) != (state < State.BARRIER):
+            self.changes.append(index)
+            row, col = divmod(index, self.cols)
+
+            if self.connectivity == 8:
+                # the cell may also be the corner of diagonal moves between its neighbours, so the masks of the
+                # whole 3x3 block around it are worked out again
+                self.link_block(row, col)
+                return
+
+            for bit, (row_step, col_step) in enumerate(DIRECTIONS[:4]):
+                if 0 <= row - row_step < self.rows and 0 <= col - col_step < self.cols:
+                    # the neighbour reaches this cell by taking the step in the same direction
+                    self.links[index - row_step * self.cols - col_step] ^= 1 << bit
+
+    def set_cost(self, index: int, cost: int) -> None:
+        """ Sets the movement cost of a cell (1 to MAX_COST), keeping the weighted cell count up to date """
+
+        if not 1 <= cost <= MAX_COST:
+            raise ValueError(f"a cell's movement cost must be between 1 and {MAX_COST}, not {cost}")
+
+        old_cost = self.cost[index]
+        if old_cost == cost:
+            return
+
+        self.weighted_count += int(cost != 1) - int(old_cost != 1)
+        self.cost[index] = cost
+        self.changes.append(index)
+
+    def min_cost(self) -> int:
+        """ Returns the lowest movement cost of any cell (used to keep the heuristics admissible) """
+
+        # only cells with a cost other than 1 are counted, so the array only has to be scanned if every cell has one
+        if self.weighted_count < self.size:
+            return 1
+        return int(self.cost.min())
+
+    def recount(self, link: bool=True) -> None:
+        """ Finds the start/finish cells, counts the barriers and weighted cells and rebuilds the neighbour index
+        again after the state/cost arrays were edited directly (the index can be left alone if no cell's
+        walkability changed) """
+
+        self.start = self.find(State.START)
+        self.finish = self.find(State.FINISH)
+        self.barrier_count = int(np.count_nonzero(self.state == State.BARRIER))
+        self.weighted_count = int(np.count_nonzero(self.cost != 1))
+
+        if link:
+            self.link()
+
+    @staticmethod
+    def check_connectivity(connectivity: int, corner_cutting: str) -> None:
+        """ Raises a ValueError if the connectivity or corner cutting rule isn't one the grid supports """
+
+        if connectivity not in (4, 8):
+            raise ValueError(f"a grid's connectivity must be 4 or 8, not {connectivity}")
+        if corner_cutting not in CORNER_RULES:
+            raise ValueError(f"the corner cutting rule must be one of {CORNER_RULES}, not {corner_cutting!r}")
+
+    def set_connectivity(self, connectivity: int, corner_cutting: str='never') -> None:
+        """ Switches between 4-connected and 8-connected movement (see CORNER_RULES) and rebuilds the neighbour
+        index """
+
+        self.check_connectivity(connectivity, corner_cutting)
+        self.connectivity, self.corner_cutting = connectivity, corner_cutting
+        self.link()
+
+    def link(self) -> None:
+        """ Rebuilds the neighbour index from the state array """
+
+        walkable = (self.state < State.BARRIER).reshape(self.rows, self.cols)
+        self.links.reshape(self.rows, self.cols)[:] = self.masks(np.pad(walkable, 1))
+        self.changes = []
+        self.relinks += 1
+
+    def link_block(self, row: int, col: int) -> None:
+        """ Works out the neighbour masks of the 3x3 block of cells around a cell again """
+
+        first_row, end_row = max(row - 1, 0), min(row + 2, self.rows)
+        first_col, end_col = max(col - 1, 0), min(col + 2, self.cols)
+
+        # the walkable cells in and around the block (the cells outside the grid are left unwalkable)
+        state = self.state.reshape(self.rows, self.cols)
+        walkable = np.zeros((end_row - first_row + 2, end_col - first_col + 2), dtype=bool)
+        rows = slice(max(first_row - 1, 0), min(end_row + 1, self.rows))
+        cols = slice(max(first_col - 1, 0), min(end_col + 1, self.cols))
+        row_offset, col_offset = 1 - first_row, 1 - first_col
+        walkable[rows.start + row_offset:rows.stop + row_offset, cols.start + col_offset:cols.stop + col_offset] = \
+            state[rows, cols] < State.BARRIER
+
+        self.links.reshape(self.rows, self.cols)[first_row:end_row, first_col:end_col] = self.masks(walkable)
+
+    def masks(self, walkable: np.ndarray) -> np.ndarray:
+        """ Returns the neighbour masks of the cells inside a 2D walkable array (which has an extra row/column
+        around the cells whose masks are wanted) """
+
+        rows, cols = walkable.shape[0] - 2, walkable.shape[1] - 2
+        links = np.zeros((rows, cols), dtype=np.uint8)
+
+        def neighbours(row_step: int, col_step: int) -> np.ndarray:
+            # whether each cell's neighbour in the given direction is walkable
+            return walkable[1 + row_step:rows + 1 + row_step, 1 + col_step:cols + 1 + col_step]
+
+        for bit, (row_step, col_step) in enumerate(DIRECTIONS[:self.connectivity]):
+            linked = neighbours(row_step, col_step)
+
+            # a diagonal move passes the corners of the cells beside it
+            if row_step and col_step and self.corner_cutting == 'never':
+                linked = linked & neighbours(row_step, 0) & neighbours(0, col_step)
+            elif row_step and col_step and self.corner_cutting == 'one':
+                linked = linked & (neighbours(row_step, 0) | neighbours(0, col_step))
+
+            links |= linked.astype(np.uint8) << bit
+
+        return links
+
+    def neighbours(self, index: int) -> list:
+        """ Returns the indices of the walkable neighbours of a cell """
+
+        return [index + offset for offset in self.offsets[self.links[index]]]
+
+    def mask(self, *states: State) -> np.ndarray:
+        """ Returns a boolean array that is True for every cell in one of the given states """
+
+        return np.isin(self.state, states)
+
+    def find(self, state: State) -> int:
+        """ Returns the index of the first cell in the given state (None if there isn't one) """
+
+        found = np.flatnonzero(self.state == state)
+        if len(found) == 0:
+            return None
+        return int(found[0])
+
+    def paint(self, index: int, state: State) -> None:
+        """ Gives a cell one of the states used to show a search, remembering it so it can be cleared later """
+
+        self.state[index] = state
+        self.painted.append(index)
+
+    def clear_search(self, states: tuple=SEARCH_STATES) -> None:
+        """ Sets the painted cells that are still in one of the given states back to blank """
+
+        if not self.painted:
+            return
+
+        cells = np.unique(np.array(self.painted, dtype=np.intp))
+        current = self.state[cells]
+        cleared = np.isin(current, states)
+        self.state[cells[cleared]] = State.BLANK
+
+        # keep the cells that still show the search (cells that were edited since they were painted are dropped)
+        self.painted = cells[~cleared & np.isin(current, SEARCH_STATES)].tolist()
+
+    def add_border(self) -> None:
+        """ Sets the cells around the edge of the grid to border cells """
+
+        state = self.state.reshape(self.rows, self.cols)
+        state[0, :] = state[-1, :] = State.BORDER
+        state[:, 0] = state[:, -1] = State.BORDER
+        self.link()
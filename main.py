@@ -48,6 +48,8 @@ def main(cell_size) -> None:
     menu_page = menu.Menu(win, width, height, page_manager.to_visualisation)
     visualisation_page = visualisation.Visualisation(win, width, height, page_manager.to_menu, cell_size)
     
+    prev_page = None
+
     running = True
     while running:
         
@@ -58,16 +60,20 @@ def main(cell_size) -> None:
         # loads the menu page
         if page_manager.curr_page == 0:
             menu_page.load()
+            pygame.display.update()
         
-        # loads the visualisation page
+        # loads the visualisation page (redrawing all of it if the menu was drawn over it)
         elif page_manager.curr_page == 1:
+            if prev_page != 1:
+                visualisation_page.redraw()
             visualisation_page.load()
+            pygame.display.update(visualisation_page.dirty_rects)
         
         else:
             pygame.quit()
             quit()
-            
-        pygame.display.update()
+
+        prev_page = page_manager.curr_page
 
     pygame.quit()
     quit()
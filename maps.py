@@ -0,0 +1,297 @@
+"""
+A module for loading and saving grids as map files, so searches can be run on real maps instead of grids drawn
+by hand.
+
+Two formats are supported:
+    - The MovingAI benchmark formats (https://movingai.com/benchmarks/formats.html): a .map file is a text grid
+      with one character per cell ('.', 'G' and 'S' can be walked through, every other character is blocked), and
+      a .scen file lists start/finish queries on a map along with the length of the shortest path between them.
+    - A compact binary format: a small header followed by one bit per cell (set if the cell is blocked) and, for
+      weighted grids only, one byte per cell for the movement costs.
+
+Both formats are read through a memory map, and the cells are converted with NumPy a whole array at a time, so
+loading a map with millions of cells never creates an object (or runs any Python code) per cell. The movement
+costs of a binary map are used straight from the memory map (copy-on-write, so editing the grid never changes
+the file), which means only the pages of the file that are used are ever read from disk.
+
+Maps only store which cells are blocked (and their movement costs), so barriers and borders are both saved as
+blocked cells and loaded as barriers, and the start/finish cells and any search shown on the grid are not saved.
+
+Usage:
+    grid = load_grid('maps/arena.map')
+    scenarios = read_scenarios('maps/arena.map.scen')
+    queries = [scenario.query(grid) for scenario in scenarios]
+
+    save_grid(grid, 'arena.grid')
+    grid = load_grid('arena.grid')
+
+Classes:
+    Scenario:
+        A start/finish query from a MovingAI .scen file.
+
+        Methods:
+            query(grid: Grid) -> tuple:
+                Returns the (start, finish) pair as flat cell indices of the grid.
+
+Functions:
+    load_grid(path: str) -> Grid:
+        Loads a grid from a MovingAI .map file or a binary map file (depending on the file extension).
+    save_grid(grid: Grid, path: str) -> None:
+        Saves a grid as a MovingAI .map file or a binary map file (depending on the file extension).
+    read_movingai_map(path: str) -> Grid:
+        Loads a grid from a MovingAI .map file.
+    write_movingai_map(grid: Grid, path: str) -> None:
+        Saves a grid as a MovingAI .map file (without its movement costs).
+    read_packed(path: str) -> Grid:
+        Loads a grid from a binary map file.
+    write_packed(grid: Grid, path: str) -> None:
+        Saves a grid as a binary map file.
+    read_scenarios(path: str) -> list:
+        Reads the queries in a MovingAI .scen file.
+    write_scenarios(scenarios: list, path: str) -> None:
+        Saves queries as a MovingAI .scen file.
+
+Constants:
+    MOVINGAI_WALKABLE (bytes): The characters of a MovingAI map that can be walked through.
+    PACKED_MAGIC (bytes): The first bytes of a binary map file.
+    PACKED_VERSION (int): The version of the binary map format that is written (and the only one that is read).
+    PACKED_HEADER (struct.Struct): The layout of a binary map file's header.
+    HAS_COSTS (int): The header flag set when a binary map file stores movement costs.
+"""
+
+import struct
+
+import numpy as np
+
+# import necessary project files
+from grid import CORNER_RULES, MAX_COST, Grid, State
+
+
+MOVINGAI_WALKABLE = b'.GS'
+
+PACKED_MAGIC = b'PFGM'
+PACKED_VERSION = 1
+
+# magic, version, connectivity, corner cutting rule (an index of CORNER_RULES), flags, rows, cols
+PACKED_HEADER = struct.Struct('<4sBBBBII')
+
+# the flag set in a binary map's header when the movement costs are stored after the blocked cells
+HAS_COSTS = 1
+
+# the state of a cell for each character of a MovingAI map
+_MOVINGAI_STATES = np.full(256, State.BARRIER, dtype=np.uint8)
+_MOVINGAI_STATES[list(MOVINGAI_WALKABLE)] = State.BLANK
+
+
+class Scenario:
+    """
+    A start/finish query from a MovingAI .scen file.
+
+    Attributes:
+        bucket (int): The bucket the query is in (queries are grouped by the length of their shortest path).
+        map_name (str): The name of the map file the query is for.
+        width (int): The width of the map.
+        height (int): The height of the map.
+        start (tuple): The (row, col) of the starting cell.
+        finish (tuple): The (row, col) of the finishing cell.
+        optimal_length (float): The length of the shortest path, with diagonal moves that can't cut corners
+            (see grid.CORNER_RULES) and cost sqrt(2).
+    """
+
+    def __init__(self, bucket: int, map_name: str, width: int, height: int, start: tuple, finish: tuple,
+                 optimal_length: float) -> None:
+
+        self.bucket = bucket
+        self.map_name = map_name
+        self.width, self.height = width, height
+        self.start, self.finish = start, finish
+        self.optimal_length = optimal_length
+
+    def query(self, grid: Grid) -> tuple:
+        """ Returns the (start, finish) pair as flat cell indices of the grid (see batch.run_batch) """
+
+        return grid.index(*self.start), grid.index(*self.finish)
+
+
+def load_grid(path: str) -> Grid:
+    """ Loads a grid from a MovingAI .map file if the path ends in .map, otherwise from a binary map file """
+
+    return read_movingai_map(path) if path.endswith('.map') else read_packed(path)
+
+
+def save_grid(grid: Grid, path: str) -> None:
+    """ Saves a grid as a MovingAI .map file if the path ends in .map, otherwise as a binary map file """
+
+    if path.endswith('.map'):
+        write_movingai_map(grid, path)
+    else:
+        write_packed(grid, path)
+
+
+def read_movingai_map(path: str) -> Grid:
+    """
+    Loads a grid from a MovingAI .map file.
+
+    The file is memory mapped and its characters are turned into states with a lookup table, one row of the map
+    per row of a NumPy array. An 'octile' map is loaded as an 8-connected grid whose diagonal moves can't cut
+    corners (the rule the MovingAI scenarios' optimal lengths are worked out with), any other type as 4-connected.
+
+    Args:
+        path (str): The path of the .map file.
+
+    Returns:
+        Grid: The map's grid.
+    """
+
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+
+    # read the header lines up to the 'map' line
+    header, position = {}, 0
+    while True:
+        end = _line_end(data, position, path)
+        line = data[position:end].tobytes().decode('ascii').strip()
+        position = end + 1
+        if line == 'map':
+            break
+        if line:
+            key, _, value = line.partition(' ')
+            header[key] = value.strip()
+
+    try:
+        rows, cols = int(header['height']), int(header['width'])
+    except (KeyError, ValueError):
+        raise ValueError(f"{path} is missing the height or width of the map") from None
+
+    # every row takes the same number of bytes, with a line ending that may be '\n' or '\r\n'
+    body = data[position:]
+    stride = cols + 1
+    if len(body) > cols and body[cols] == ord('\r'):
+        stride += 1
+    if len(body) < rows * stride:
+        if len(body) < (rows - 1) * stride + cols:
+            raise ValueError(f"{path} has fewer than {rows} rows of {cols} cells")
+        body = np.concatenate((body, np.zeros(rows * stride - len(body), dtype=np.uint8)))
+
+    chars = body[:rows * stride].reshape(rows, stride)[:, :cols]
+    state = _MOVINGAI_STATES[chars].ravel()
+    del data, body, chars
+
+    connectivity = 8 if header.get('type') == 'octile' else 4
+    return Grid(rows, cols, state, connectivity=connectivity, corner_cutting='never')
+
+
+def _line_end(data: np.ndarray, position: int, path: str) -> int:
+    """ Returns the index of the end of the line starting at a position of a memory mapped file """
+
+    # header lines are short, so only look a little way ahead instead of searching the whole file
+    ahead = data[position:position + 256]
+    ends = np.flatnonzero(ahead == ord('\n'))
+    if len(ends) == 0:
+        raise ValueError(f"{path} is not a MovingAI map (no 'map' line)")
+
+    return position + int(ends[0])
+
+
+def write_movingai_map(grid: Grid, path: str) -> None:
+    """ Saves a grid as a MovingAI .map file (barriers and borders are written as '@', every other cell as '.').
+    The format has no movement costs, so they are not saved """
+
+    chars = np.where(grid.state < State.BARRIER, ord('.'), ord('@')).astype(np.uint8).reshape(grid.rows, grid.cols)
+    lines = np.hstack((chars, np.full((grid.rows, 1), ord('\n'), dtype=np.uint8)))
+
+    map_type = 'octile' if grid.connectivity == 8 else 'tile'
+    with open(path, 'wb') as file:
+        file.write(f"type {map_type}\nheight {grid.rows}\nwidth {grid.cols}\nmap\n".encode('ascii'))
+        file.write(lines.tobytes())
+
+
+def read_packed(path: str) -> Grid:
+    """
+    Loads a grid from a binary map file.
+
+    The blocked cells are unpacked from one bit per cell with NumPy, and the movement costs (if the file has them)
+    are used straight from the memory map, copy-on-write.
+
+    Args:
+        path (str): The path of the binary map file.
+
+    Returns:
+        Grid: The map's grid, with the connectivity and corner cutting rule it was saved with.
+    """
+
+    data = np.memmap(path, dtype=np.uint8, mode='c')
+    if len(data) < PACKED_HEADER.size:
+        raise ValueError(f"{path} is not a binary map file")
+
+    magic, version, connectivity, corner_rule, flags, rows, cols = PACKED_HEADER.unpack(
+        data[:PACKED_HEADER.size].tobytes())
+    if magic != PACKED_MAGIC:
+        raise ValueError(f"{path} is not a binary map file")
+    if version != PACKED_VERSION:
+        raise ValueError(f"{path} is version {version} of the binary map format (only version {PACKED_VERSION} "
+                         "can be read)")
+    if connectivity not in (4, 8):
+        raise ValueError(f"{path} has a connectivity of {connectivity} (only 4 or 8 can be read)")
+    if corner_rule >= len(CORNER_RULES):
+        raise ValueError(f"{path} has an unknown corner cutting rule ({corner_rule})")
+
+    size = rows * cols
+    packed_end = PACKED_HEADER.size + (size + 7) // 8
+    cost_end = packed_end + (size if flags & HAS_COSTS else 0)
+    if len(data) < cost_end:
+        raise ValueError(f"{path} is shorter than a {rows}x{cols} map")
+
+    blocked = np.unpackbits(data[PACKED_HEADER.size:packed_end], count=size)
+    state = blocked * np.uint8(State.BARRIER)
+    cost = data[packed_end:cost_end] if flags & HAS_COSTS else None
+    if cost is not None and size and not 1 <= cost.min() <= cost.max() <= MAX_COST:
+        raise ValueError(f"{path} has movement costs outside 1 to {MAX_COST}")
+
+    return Grid(rows, cols, state, cost=cost, connectivity=connectivity, corner_cutting=CORNER_RULES[corner_rule])
+
+
+def write_packed(grid: Grid, path: str) -> None:
+    """ Saves a grid as a binary map file: the header, then a bit per cell (set if the cell is blocked) and, if
+    any cell has a movement cost other than 1, a byte per cell for the costs """
+
+    flags = HAS_COSTS if grid.weighted_count else 0
+    header = PACKED_HEADER.pack(PACKED_MAGIC, PACKED_VERSION, grid.connectivity,
+                                CORNER_RULES.index(grid.corner_cutting), flags, grid.rows, grid.cols)
+
+    with open(path, 'wb') as file:
+        file.write(header)
+        file.write(np.packbits(grid.state >= State.BARRIER).tobytes())
+        if flags & HAS_COSTS:
+            file.write(np.ascontiguousarray(grid.cost, dtype=np.uint8).tobytes())
+
+
+def read_scenarios(path: str) -> list:
+    """ Reads the queries in a MovingAI .scen file and returns a list of Scenarios """
+
+    scenarios = []
+
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+
+            # skip the version line and blank lines
+            if len(fields) != 9:
+                continue
+
+            bucket, map_name, width, height, start_x, start_y, finish_x, finish_y, optimal_length = fields
+            scenarios.append(Scenario(int(bucket), map_name, int(width), int(height),
+                                      (int(start_y), int(start_x)), (int(finish_y), int(finish_x)),
+                                      float(optimal_length)))
+
+    return scenarios
+
+
+def write_scenarios(scenarios: list, path: str) -> None:
+    """ Saves queries as a MovingAI .scen file (the x of a cell is its column and the y its row) """
+
+    with open(path, 'w') as file:
+        file.write("version 1\n")
+        for scenario in scenarios:
+            (start_y, start_x), (finish_y, finish_x) = scenario.start, scenario.finish
+            file.write(f"{scenario.bucket}\t{scenario.map_name}\t{scenario.width}\t{scenario.height}\t"
+                       f"{start_x}\t{start_y}\t{finish_x}\t{finish_y}\t{scenario.optimal_length:.8f}\n")
@@ -0,0 +1,204 @@
+"""
+A module for running the MovingAI benchmark scenarios (https://movingai.com/benchmarks/) without the
+visualisation.
+
+Every query in one or more .scen files is run with each algorithm from engine.ALGORITHMS, on the map the
+scenario file is for (see maps.py), using batch.run_batch (or batch.run_parallel with --processes). The cost of
+each path found is checked against the optimal length given in the scenario file, and the throughput of each
+algorithm is reported as queries per second and nodes expanded per query, so every algorithm is measured on the
+same standard, reproducible set of queries. Queries per second are worked out from the wall-clock time of each
+algorithm's batch, so running with more processes shows the speedup; the time the searches themselves took
+(summed over the worker processes) is reported separately. The results are printed as a table and can be saved
+as CSV or JSON.
+
+The optimal lengths in MovingAI scenarios allow diagonal moves that cost sqrt(2) but can't cut corners, which is
+how maps.read_movingai_map loads an 'octile' map. The file only gives them to 8 decimal places, so a path counts
+as optimal if its cost is within a small tolerance of the optimal length.
+
+Usage:
+    python scenarios.py maps/arena.map.scen
+    python scenarios.py maps/*.scen --algorithms astar jps hpa-star --processes 8 --output scoreboard.csv
+
+Functions:
+    find_map(scenario_path: str, map_name: str) -> str:
+        Returns the path of the map a scenario file is for.
+    check_scenarios(grid: Grid, scenarios: list) -> None:
+        Checks that the scenarios' queries are on walkable cells of the grid.
+    score(batch_result: BatchResult, scenarios: list, tolerance: float=1e-4, wall_time: float=None) -> dict:
+        Compares the paths found by a batch of queries with the scenarios' optimal lengths.
+    run_scenarios(grid: Grid, scenarios: list, algorithms: list, heuristic: str=None, processes: int=1,
+                  tolerance: float=1e-4) -> list:
+        Runs every scenario with every algorithm and returns a list of scores.
+"""
+
+import argparse
+import os
+import time
+
+# import necessary project files
+import batch
+import benchmark
+import engine
+import maps
+from grid import Grid, State
+
+
+def find_map(scenario_path: str, map_name: str) -> str:
+    """ Returns the path of the map a scenario file is for: the map named in the file if it is next to the
+    scenario file, otherwise the scenario file's path without the .scen extension """
+
+    named_path = os.path.join(os.path.dirname(scenario_path), os.path.basename(map_name))
+    if os.path.exists(named_path):
+        return named_path
+
+    return scenario_path[:-len('.scen')] if scenario_path.endswith('.scen') else named_path
+
+
+def check_scenarios(grid: Grid, scenarios: list) -> None:
+    """ Checks that the scenarios are for a map the size of the grid and that their queries are on walkable cells
+    (raises a ValueError if not) """
+
+    for scenario in scenarios:
+        if (scenario.height, scenario.width) != (grid.rows, grid.cols):
+            raise ValueError(f"a scenario is for a {scenario.width}x{scenario.height} map, but the map is "
+                             f"{grid.cols}x{grid.rows}")
+
+        for row, col in (scenario.start, scenario.finish):
+            if not (0 <= row < grid.rows and 0 <= col < grid.cols) or grid.state[grid.index(row, col)] >= State.BARRIER:
+                raise ValueError(f"the cell at x = {col}, y = {row} of {scenario.map_name} can't be walked through")
+
+
+def score(batch_result: batch.BatchResult, scenarios: list, tolerance: float=1e-4, wall_time: float=None) -> dict:
+    """
+    Compares the paths found by a batch of queries with the scenarios' optimal lengths.
+
+    Args:
+        batch_result (BatchResult): The results of running the scenarios' queries, in the same order.
+        scenarios (list): The Scenarios that were run.
+        tolerance (float): How far (relative to the optimal length, or absolute if it is below 1) a path's cost can
+            be from the optimal length and still count as optimal.
+        wall_time (float): The wall-clock time the batch took, which the throughput is worked out from (the
+            batch's own elapsed_time if not given).
+
+    Returns:
+        dict: The number of queries, paths found, optimal paths, paths shorter than the optimal length (which
+            means the map or the algorithm doesn't follow the scenarios' rules) and the worst ratio of a path's
+            cost to the optimal length, with the throughput, wall-clock time and search time of the batch.
+    """
+
+    if wall_time is None:
+        wall_time = batch_result.elapsed_time
+
+    found = optimal = shorter = 0
+    worst_ratio = 1.0
+
+    for result, scenario in zip(batch_result.results, scenarios):
+        if not result.is_found:
+            continue
+
+        found += 1
+        allowed = tolerance * max(scenario.optimal_length, 1)
+        if abs(result.path_cost - scenario.optimal_length) <= allowed:
+            optimal += 1
+        elif result.path_cost < scenario.optimal_length:
+            shorter += 1
+        elif scenario.optimal_length > 0:
+            worst_ratio = max(worst_ratio, result.path_cost / scenario.optimal_length)
+
+    return {
+        'algorithm': batch_result.algorithm,
+        'queries': len(batch_result.results),
+        'found': found,
+        'optimal': optimal,
+        'shorter': shorter,
+        'worst_ratio': round(worst_ratio, 6),
+        'queries_per_second': round(len(batch_result.results) / wall_time if wall_time > 0 else float('inf'), 3),
+        'nodes_per_query': round(batch_result.nodes_per_query, 3),
+        'wall_time': round(wall_time, 6),
+        'search_time': round(batch_result.elapsed_time, 6)
+    }
+
+
+def run_scenarios(grid: Grid, scenarios: list, algorithms: list, heuristic: str=None, processes: int=1,
+                  tolerance: float=1e-4) -> list:
+    """
+    Runs every scenario with every algorithm and returns a list of scores (one dict per algorithm, see score).
+
+    Args:
+        grid (Grid): The map the scenarios are for.
+        scenarios (list): The Scenarios to run (see maps.read_scenarios).
+        algorithms (list): The names of the algorithms to run (keys of engine.ALGORITHMS).
+        heuristic (str): The heuristic used by the searches that need one (a key of engine.HEURISTICS, or None for
+            the one matching the grid's connectivity).
+        processes (int): The number of worker processes the queries are spread over (see batch.run_parallel).
+            Each algorithm gets a pool of its own, so the wall-clock time of its batch can be measured.
+        tolerance (float): How far a path's cost can be from the optimal length and still count as optimal.
+
+    Returns:
+        list: The score of each algorithm, in the same order as algorithms.
+    """
+
+    check_scenarios(grid, scenarios)
+    queries = [scenario.query(grid) for scenario in scenarios]
+
+    scores = []
+    for algorithm in algorithms:
+        run_start = time.perf_counter()
+        if processes == 1:
+            batch_result = batch.run_batch(grid, queries, algorithm, heuristic)
+        else:
+            batch_result = batch.run_parallel(grid, queries, [algorithm], heuristic, processes)[0]
+        wall_time = time.perf_counter() - run_start
+
+        scores.append(score(batch_result, scenarios, tolerance, wall_time))
+
+    return scores
+
+
+def print_score(row: dict) -> None:
+    """ Prints one algorithm's score as a line of the results table """
+
+    shorter = f", {row['shorter']} shorter than optimal" if row['shorter'] else ''
+    print(f"{row['map']:<24} {row['algorithm']:<20} {row['queries_per_second']:>10.1f} queries/s, "
+          f"{row['nodes_per_query']:.1f} nodes/query, {row['found']}/{row['queries']} found, "
+          f"{row['optimal']} optimal{shorter}, worst = {row['worst_ratio']:.3f}x optimal")
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Run the MovingAI benchmark scenarios without the visualisation")
+    parser.add_argument('scenarios', nargs='+', help=".scen files (each map is found next to its scenario file)")
+    parser.add_argument('--map', help="map file to use for every scenario file, instead of finding each one")
+    parser.add_argument('--algorithms', nargs='+', default=list(engine.ALGORITHMS), choices=list(engine.ALGORITHMS))
+    parser.add_argument('--heuristic', choices=list(engine.HEURISTICS),
+                        help="heuristic used by the searches that need one (by default the one matching the map)")
+    parser.add_argument('--processes', type=int, default=1, help="worker processes the queries are spread over")
+    parser.add_argument('--limit', type=int, help="only run the first LIMIT scenarios of each file")
+    parser.add_argument('--tolerance', type=float, default=1e-4,
+                        help="relative difference from the optimal length that still counts as optimal")
+    parser.add_argument('--output', help="file to save the results to (.csv or .json)")
+    args = parser.parse_args()
+
+    results = []
+
+    for scenario_path in args.scenarios:
+        scenarios = maps.read_scenarios(scenario_path)[:args.limit]
+        if not scenarios:
+            print(f"{scenario_path} has no scenarios")
+            continue
+
+        map_path = args.map or find_map(scenario_path, scenarios[0].map_name)
+        grid = maps.load_grid(map_path)
+
+        for row in run_scenarios(grid, scenarios, args.algorithms, args.heuristic, args.processes, args.tolerance):
+            row = {'map': os.path.basename(map_path), **row}
+            results.append(row)
+            print_score(row)
+
+    if args.output:
+        benchmark.save_results(results, args.output)
+
+
+# checks that the main() function is being run from this file (scenarios.py), and not elsewhere
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,43 @@
+import numpy as np
+import os
 import pygame
-import random
 from typing import Callable
 
 # import necessary project files
 import algorithms
+import batch
 import cell
 import basicUI
 import colours
+import engine
+import grid
 from cell import Cell
+from grid import State
 
 pygame.init()
 
 
+# the number keys that can be held while left-clicking to paint a cell's movement cost (key 1 paints the normal cost)
+TERRAIN_KEYS = {getattr(pygame, f'K_{cost}'): cost for cost in range(1, 10)}
+
+# the speeds the algorithms can be drawn at: (button text, steps per frame, target fps, instant)
+SPEEDS = [
+    ("Speed: 1", 1, None, False),
+    ("Speed: 10", 10, None, False),
+    ("Speed: 100", 100, None, False),
+    ("Speed: 60 FPS", 1, 60, False),
+    ("Speed: instant", 1, None, True)
+]
+
+# the ways the algorithms can move between cells: (button text, connectivity, corner cutting rule)
+MOVES = [
+    ("Moves: 4-way", 4, 'never'),
+    ("Moves: 8-way", 8, 'never'),
+    ("Moves: 8-way cut one", 8, 'one'),
+    ("Moves: 8-way cut all", 8, 'always')
+]
+
+
 class Visualisation:
     """
     Represents the page where pathfinding algorithms are run and visualized.
@@ -28,14 +54,26 @@ class Visualisation:
         cell_size (int): The size of each cell in the grid. Default is 10.
 
     Methods:
-        run_dijkstra() -> None:
-            Runs Dijkstra's algorithm and displays the analysis.
-        run_a_star() -> None:
-            Runs the A* algorithm and displays the analysis.
-        run_greedy_bfs() -> None:
-            Runs the Greedy Best-First Search algorithm and displays the analysis.
+        run_algorithm(algo) -> None:
+            Starts an algorithm, which is then advanced each frame by load().
+        algorithm_func() -> None:
+            Switches to the next algorithm.
+        run_func() -> None:
+            Starts the algorithm picked with the algorithm button.
+        compare_func() -> None:
+            Runs every algorithm on the grid (headless, in parallel) and shows their paths and stats together.
+        draw_comparison() -> None:
+            Draws the paths found by every algorithm over the grid, with a table of their stats.
+        speed_func() -> None:
+            Switches to the next speed the algorithms are drawn at.
+        moves_func() -> None:
+            Switches to the next way of moving between cells (4 or 8 directions and the corner cutting rule).
         init_grid() -> None:
             Initializes the grid for the visualization page.
+        get_cell(row: int, col: int) -> Cell:
+            Returns a view of a cell in the grid.
+        cell_at(index: int) -> Cell:
+            Returns a view of the cell at a flat index (None if the index is None).
         reset_grid() -> None:
             Resets the grid by clearing all cells except borders.
         random_func() -> None:
@@ -44,10 +82,10 @@ class Visualisation:
             Stops the currently running algorithm.
         in_bounds(x: int, y: int, mouse_pos: tuple) -> bool:
             Checks if a coordinate is within the grid bounds.
-        check_grid(colour: tuple) -> Cell:
-            Checks if a certain type of cell (by color) is on the grid.
+        redraw() -> None:
+            Makes the next frame redraw the whole page.
         draw_grid() -> None:
-            Draws the grid on the visualization page.
+            Draws the cells that have changed since the last frame.
         load() -> None:
             Checks for interactions with elements or keys and updates the visualization accordingly.
     """
@@ -61,11 +99,21 @@ class Visualisation:
         self.ui_width = self.width - self.grid_width
         self.menu_func = menu_func
 
-        self.grid = []
+        self.grid = None
         self.cell_size = cell_size
         self.rows = int(self.height // self.cell_size)
         self.cols = int(self.grid_width // self.cell_size)
         self.is_running = False
+        self.running_algo = None
+
+        # the (label, colour, result) of every algorithm in the last comparison (None if it isn't being shown)
+        self.comparison = None
+
+        # the state and movement cost of each cell when it was last drawn (None forces the whole page to be
+        # redrawn), and the areas of the surface that were drawn on in the last frame
+        self.drawn_state = None
+        self.drawn_cost = None
+        self.dirty_rects = []
 
         self.init_grid()
         self.start_cell = None
@@ -73,96 +121,230 @@ class Visualisation:
 
         self.buttons = []
 
+        self.bfs_algo = algorithms.BreadthFirstSearch(self.surface, self, self.grid)
         self.dijkstra_algo = algorithms.Dijkstra(self.surface, self, self.grid)
         self.a_star_algo = algorithms.AStar(self.surface, self, self.grid)
+        self.jps_algo = algorithms.JumpPointSearch(self.surface, self, self.grid)
+        self.lpa_star_algo = algorithms.LifelongAStar(self.surface, self, self.grid)
+        self.hpa_star_algo = algorithms.HierarchicalAStar(self.surface, self, self.grid)
         self.greedy_bfs_algo = algorithms.GreedyBFS(self.surface, self, self.grid)
-
-        self.dijkstra_button = basicUI.Button(self.surface, "Dijkstra", self.run_dijkstra,
-                                              (0, 0), fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
-        self.dijkstra_button.center = (width - (self.ui_width // 2), 100)
-        self.buttons.append(self.dijkstra_button)
-
-        self.a_star_button = basicUI.Button(self.surface, "A* Algorithm", self.run_a_star,
-                                            (0, 0), fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
-        self.a_star_button.center = (width - (self.ui_width // 2), 150)
-        self.buttons.append(self.a_star_button)
-
-        self.greedy_bfs_button = basicUI.Button(self.surface, "Greedy BFS", self.run_greedy_bfs,
-                                                (0, 0), fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
-        self.greedy_bfs_button.center = (width - (self.ui_width // 2), 200)
-        self.buttons.append(self.greedy_bfs_button)
+        self.bidirectional_bfs_algo = algorithms.BidirectionalBFS(self.surface, self, self.grid)
+        self.bidirectional_a_star_algo = algorithms.BidirectionalAStar(self.surface, self, self.grid)
+
+        # the algorithms that can be picked with the algorithm button
+        self.algos = [self.dijkstra_algo, self.a_star_algo, self.jps_algo, self.lpa_star_algo, self.hpa_star_algo,
+                      self.bfs_algo, self.greedy_bfs_algo, self.bidirectional_bfs_algo, self.bidirectional_a_star_algo]
+        self.algo_index = 0
+
+        self.algorithm_button = basicUI.Button(self.surface, self.algos[self.algo_index].label, self.algorithm_func,
+                                               (0, 0), fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
+        self.algorithm_button.center = (width - (self.ui_width // 2), 85)
+        self.buttons.append(self.algorithm_button)
+
+        self.run_button = basicUI.Button(self.surface, "Run", self.run_func,
+                                         (0, 0), fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
+        self.run_button.center = (width - (self.ui_width // 2), 130)
+        self.buttons.append(self.run_button)
+
+        self.speed = 0
+        self.speed_button = basicUI.Button(self.surface, SPEEDS[self.speed][0], self.speed_func, (0, 0),
+                                           fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
+        self.speed_button.center = (width - (self.ui_width // 2), 175)
+        self.buttons.append(self.speed_button)
 
         self.stop_button = basicUI.Button(self.surface, "Stop", self.stop_func, (0, 0),
                                           fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
-        self.stop_button.center = (width-(self.ui_width // 2), 300)
+        self.stop_button.center = (width-(self.ui_width // 2), 220)
         self.buttons.append(self.stop_button)
 
         self.reset_button = basicUI.Button(self.surface, "Reset", self.reset_grid, (0, 0),
                                            fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
-        self.reset_button.center = (width - (self.ui_width // 2), 350)
+        self.reset_button.center = (width - (self.ui_width // 2), 265)
         self.buttons.append(self.reset_button)
 
         self.random_button = basicUI.Button(self.surface, "Random", self.random_func, (0, 0),
                                             fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
-        self.random_button.center = (width - (self.ui_width // 2), 400)
+        self.random_button.center = (width - (self.ui_width // 2), 310)
         self.buttons.append(self.random_button)
 
         self.menu_button = basicUI.Button(self.surface, "Menu [key]", self.menu_func, (0, 0),
                                           fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
-        self.menu_button.center = (width - (self.ui_width // 2), 450)
+        self.menu_button.center = (width - (self.ui_width // 2), 355)
         self.buttons.append(self.menu_button)
 
-    def run_dijkstra(self) -> None:
+        self.compare_button = basicUI.Button(self.surface, "Compare", self.compare_func, (0, 0),
+                                             fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
+        self.compare_button.center = (width - (self.ui_width // 2), 400)
+        self.buttons.append(self.compare_button)
+
+        self.moves = 0
+        self.moves_button = basicUI.Button(self.surface, MOVES[self.moves][0], self.moves_func, (0, 0),
+                                           fg=colours.UI_TEXT_COLOUR, bg=colours.UI_BUTTON_COLOUR)
+        self.moves_button.center = (width - (self.ui_width // 2), 445)
+        self.buttons.append(self.moves_button)
+
+    def run_algorithm(self, algo) -> None:
+        """ Starts an algorithm, which is then advanced each frame by load() """
+
+        self.clear_comparison()
+        analysis = algo.start(self.start_cell, self.finish_cell)
+
+        # the analysis is only returned straight away if the algorithm has already finished
+        if analysis is not None:
+            print(analysis)
+        else:
+            self.running_algo = algo
+
+    def algorithm_func(self) -> None:
+        """ Switches to the next algorithm """
+
+        self.algo_index = (self.algo_index + 1) % len(self.algos)
+
+        # the button changes size with its text, so redraw the page
+        self.algorithm_button.change_text(self.algos[self.algo_index].label)
+        self.redraw()
+
+    def run_func(self) -> None:
+        """ Starts the algorithm picked with the algorithm button """
+
+        self.run_algorithm(self.algos[self.algo_index])
+
+    def compare_func(self) -> None:
+        """ Runs every algorithm on the grid (headless, in parallel) and shows their paths and stats together """
+
+        if not (self.start_cell and self.finish_cell):
+            print("start/finish cell not placed")
+            return
+
+        self.clear_comparison()
+        self.grid.clear_search()
+
+        # every algorithm answers the same query on the same grid, each in its own process if there are enough CPUs
+        names = {search_class: name for name, search_class in engine.ALGORITHMS.items()}
+        query = [(self.start_cell.index, self.finish_cell.index)]
+        batches = batch.run_parallel(self.grid, query, [names[algo.search_class] for algo in self.algos],
+                                     processes=min(len(self.algos), os.cpu_count() or 1))
+
+        self.comparison = [(algo.label, colours.COMPARE_COLOURS[i % len(colours.COMPARE_COLOURS)], result.results[0])
+                           for i, (algo, result) in enumerate(zip(self.algos, batches))]
+
+        for _, _, result in self.comparison:
+            print(result.summary() if result.is_found else f"[{result.name:^10}] path not found")
+
+        self.redraw()
+
+    def clear_comparison(self) -> None:
+        """ Stops showing the last comparison (the next frame redraws the whole page to remove it) """
+
+        if self.comparison is not None:
+            self.comparison = None
+            self.redraw()
+
+    def draw_comparison(self) -> None:
+        """ Draws the paths found by every algorithm over the grid, with a table of their stats """
 
-        analysis = self.dijkstra_algo.run(self.start_cell, self.finish_cell)
-        print(analysis)
+        count = len(self.comparison)
+        spacing = max(self.cell_size // (count + 1), 1)
+        line_width = max(self.cell_size // 8, 1)
 
-    def run_a_star(self) -> None:
+        # each path is drawn through the cells slightly offset from the others, so paths sharing cells stay visible
+        for i, (_, colour, result) in enumerate(self.comparison):
+            offset = (i + 1) * spacing
+            points = [(col * self.cell_size + offset, row * self.cell_size + offset)
+                      for row, col in map(self.grid.position, result.path)]
+            if len(points) > 1:
+                pygame.draw.lines(self.surface, colour, False, points, line_width)
 
-        analysis = self.a_star_algo.run(self.start_cell, self.finish_cell)
-        print(analysis)
+        # draw the stats table in the top left corner of the grid (on a translucent background, so the grid
+        # underneath can still be seen)
+        row_height = 20
+        x, y = self.cell_size + 5, self.cell_size + 5
+        table = pygame.Rect(x, y, 360, row_height * (count + 1) + 10)
+        background = pygame.Surface(table.size, pygame.SRCALPHA)
+        background.fill((*colours.UI_BG_COLOUR, 210))
+        self.surface.blit(background, table)
+        pygame.draw.rect(self.surface, colours.UI_TEXT_COLOUR, table, width=1)
 
-    def run_greedy_bfs(self) -> None:
+        basicUI.text(self.surface, "Algorithm", (x + 25, y + 5), colours.WHITE, 20, 'topleft')
+        basicUI.text(self.surface, "Nodes", (x + 175, y + 5), colours.WHITE, 20, 'topleft')
+        cost_column = "Cost" if self.grid.weighted_count or self.grid.connectivity == 8 else "Length"
+        basicUI.text(self.surface, cost_column, (x + 235, y + 5), colours.WHITE, 20, 'topleft')
+        basicUI.text(self.surface, "Time", (x + 300, y + 5), colours.WHITE, 20, 'topleft')
 
-        analysis = self.greedy_bfs_algo.run(self.start_cell, self.finish_cell)
-        print(analysis)
+        for i, (label, colour, result) in enumerate(self.comparison):
+            row_y = y + 5 + row_height * (i + 1)
+            length = round(result.path_cost, 2) if result.is_found else "-"
+
+            pygame.draw.rect(self.surface, colour, (x + 5, row_y + 2, 12, 12))
+            basicUI.text(self.surface, label, (x + 25, row_y), colours.WHITE, 20, 'topleft')
+            basicUI.text(self.surface, str(result.nodes_searched), (x + 175, row_y), colours.WHITE, 20, 'topleft')
+            basicUI.text(self.surface, str(length), (x + 235, row_y), colours.WHITE, 20, 'topleft')
+            basicUI.text(self.surface, f"{result.elapsed_time * 1000:.1f}ms", (x + 300, row_y),
+                         colours.WHITE, 20, 'topleft')
+
+    def speed_func(self) -> None:
+        """ Switches to the next speed the algorithms are drawn at """
+
+        self.speed = (self.speed + 1) % len(SPEEDS)
+        text, steps_per_frame, target_fps, instant = SPEEDS[self.speed]
+
+        for algo in self.algos:
+            algo.set_speed(steps_per_frame, target_fps, instant)
+
+        # the button changes size with its text, so redraw the page
+        self.speed_button.change_text(text)
+        self.redraw()
+
+    def moves_func(self) -> None:
+        """ Switches to the next way of moving between cells (4 or 8 directions and the corner cutting rule) """
+
+        self.moves = (self.moves + 1) % len(MOVES)
+        text, connectivity, corner_cutting = MOVES[self.moves]
+
+        # the last search and comparison were made with the old moves, so they are stopped and cleared
+        self.running_algo = None
+        self.clear_comparison()
+        self.grid.clear_search()
+        self.grid.set_connectivity(connectivity, corner_cutting)
+
+        # the button changes size with its text, so redraw the page
+        self.moves_button.change_text(text)
+        self.redraw()
 
     def init_grid(self) -> None:
         """ Creates the grid when the visualisation page is first ran """
         
-        self.grid = []
-
-        for i in range(self.rows):
+        self.grid = grid.Grid(self.rows, self.cols)
+        self.grid.add_border()
 
-            self.grid.append([])
+    def get_cell(self, row: int, col: int) -> Cell:
+        """ Returns a view of a cell in the grid """
 
-            for j in range(self.cols):
+        return cell.Cell(self.grid, row, col, self.cell_size)
 
-                self.grid[i].append(cell.Cell(i, j, self.cell_size))
+    def cell_at(self, index: int) -> Cell:
+        """ Returns a view of the cell at a flat index (None if the index is None) """
 
-                if i == 0 or j == 0 or i == self.rows - 1 or j == self.cols - 1:
-                    self.grid[i][j].colour = colours.BORDER_COLOUR
-        
-        for row in self.grid:
-            for node in row:
-                node.update_neighbours(self.rows, self.cols, self.grid)
+        if index is not None:
+            return self.get_cell(*self.grid.position(index))
 
     def reset_grid(self) -> None:
-        """ Resets all cells (except for borders) to blank cells """
+        """ Resets all cells (except for borders) to blank cells with the normal movement cost """
+
+        self.stop_func()
+        self.clear_comparison()
 
-        for row in self.grid:
-            for node in row:
-                if node.colour != colours.BLANK_COLOUR and node.colour != colours.BORDER_COLOUR:
-                    node.colour = colours.BLANK_COLOUR
+        self.grid.state[self.grid.state != State.BORDER] = State.BLANK
+        self.grid.cost[:] = 1
+        self.grid.recount()
 
     def random_func(self) -> None:
         """ Sets a random amount of cells to barriers """
         
-        for row in self.grid:
-            for node in row:
-                chance = random.randint(1, 15)
-                if (node.colour == colours.BLANK_COLOUR or node.colour == colours.PATH_COLOUR) and chance == 1:
-                    node.colour = colours.BARRIER_COLOUR
+        chance = np.random.randint(1, 16, self.grid.size)
+        barriers = self.grid.mask(State.BLANK, State.PATH) & (chance == 1)
+        self.grid.state[barriers] = State.BARRIER
+        self.grid.recount()
 
     def stop_func(self) -> None:
         """ Stops the algorithm that is currently running """
@@ -181,35 +363,49 @@ class Visualisation:
 
         return True
 
-    def check_grid(self, colour: tuple) -> Cell:
-        """ Checks if a certain type of cell (by colour) is on the grid """
+    def redraw(self) -> None:
+        """ Makes the next frame redraw the whole page (e.g. after another page has been drawn over it) """
 
-        for row in self.grid:
-            for node in row:
-                if node.colour == colour:
-                    return node
+        self.drawn_state = None
 
     def draw_grid(self) -> None:
-        """ Draws the grid on the visualisation page """
+        """ Draws the cells that have changed state (or cost) since the last frame and adds their rects to
+        dirty_rects """
+
+        full_redraw = self.drawn_state is None
+
+        if full_redraw:
+            self.drawn_state = self.grid.state.copy()
+            self.drawn_cost = self.grid.cost.copy()
+            changed = np.arange(self.grid.size)
+        else:
+            changed = np.flatnonzero((self.grid.state != self.drawn_state) | (self.grid.cost != self.drawn_cost))
+            self.drawn_state[changed] = self.grid.state[changed]
+            self.drawn_cost[changed] = self.grid.cost[changed]
+
+        # blank cells are drawn in the colour of their movement cost
+        terrain = len(colours.TERRAIN_COLOURS) - 1
+        for index, code, cost in zip(changed.tolist(), self.drawn_state[changed].tolist(),
+                                     self.drawn_cost[changed].tolist()):
 
-        for row in self.grid:
-            for node in row:
-                node.draw(self.surface)
+            colour = colours.TERRAIN_COLOURS[min(cost, terrain)] if code == State.BLANK else colours.STATE_COLOURS[code]
 
-        for i in range(self.cols):
-            pygame.draw.line(self.surface, colours.GRID_LINES_COLOUR,
-                             (i * self.cell_size, 0), (i * self.cell_size, self.height))
+            row, col = divmod(index, self.cols)
+            rect = pygame.Rect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
 
-        for j in range(self.rows):
-            pygame.draw.line(self.surface, colours.GRID_LINES_COLOUR,
-                             (0, j * self.cell_size), (self.grid_width, j * self.cell_size))
+            # fill the cell with the grid line colour, then draw the cell inside it (leaving its top and left edges)
+            pygame.draw.rect(self.surface, colours.GRID_LINES_COLOUR, rect)
+            pygame.draw.rect(self.surface, colour, (rect.x + 1, rect.y + 1, self.cell_size - 1, self.cell_size - 1))
+
+            if not full_redraw:
+                self.dirty_rects.append(rect)
 
     def load(self) -> None:
         """ Checks for any interactions with elements or keys and
         checks if the user has added nodes to the grid """
 
-        self.start_cell = self.check_grid(colours.START_COLOUR)
-        self.finish_cell = self.check_grid(colours.FINISH_COLOUR)
+        self.start_cell = self.cell_at(self.grid.start)
+        self.finish_cell = self.cell_at(self.grid.finish)
 
         keys = pygame.key.get_pressed()
 
@@ -226,34 +422,35 @@ class Visualisation:
 
             if pygame.mouse.get_pressed()[0] and self.in_bounds(x_coord, y_coord, mouse_pos):
 
-                clicked_node = self.grid[y_coord][x_coord]
-                
-                if clicked_node.colour != colours.QUEUED_COLOUR and clicked_node.colour != colours.VISITED_COLOUR:
+                clicked_node = self.get_cell(y_coord, x_coord)
+                terrain_cost = next((cost for key, cost in TERRAIN_KEYS.items() if keys[key]), None)
+
+                # holding a number key paints the cell's movement cost instead
+                if terrain_cost is not None:
+                    clicked_node.cost = terrain_cost
+
+                elif clicked_node.state != State.QUEUED and clicked_node.state != State.VISITED:
                     
                     # if the start node is not on the grid, then the next click will be a start node
-                    if not self.check_grid(colours.START_COLOUR):
-                        clicked_node.colour = colours.START_COLOUR
+                    if self.grid.start is None:
+                        clicked_node.state = State.START
 
                     # if the start node is on the grid but there is no finish node, then the next click will be a finish node
-                    elif not self.check_grid(colours.FINISH_COLOUR) and clicked_node.colour != colours.START_COLOUR: 
-                        clicked_node.colour = colours.FINISH_COLOUR
+                    elif self.grid.finish is None and clicked_node.state != State.START: 
+                        clicked_node.state = State.FINISH
 
                     # if the start node and finish node are already on the grid then the next click will be a barrier node
-                    elif clicked_node.colour != colours.START_COLOUR and clicked_node.colour != colours.FINISH_COLOUR:
-                        clicked_node.colour = colours.BARRIER_COLOUR
+                    elif clicked_node.state != State.START and clicked_node.state != State.FINISH:
+                        clicked_node.state = State.BARRIER
 
             elif pygame.mouse.get_pressed()[2] and self.in_bounds(x_coord, y_coord, mouse_pos):
 
-                clicked_node = self.grid[y_coord][x_coord]
+                clicked_node = self.get_cell(y_coord, x_coord)
                 
-                if clicked_node.colour != colours.QUEUED_COLOUR and clicked_node.colour != colours.VISITED_COLOUR:
+                if clicked_node.state != State.QUEUED and clicked_node.state != State.VISITED:
                     
-                    clicked_node.colour = colours.BLANK_COLOUR
-
-        self.surface.fill(colours.UI_BG_COLOUR)
-        self.draw_grid()
-
-        basicUI.text(self.surface, "PATHFINDING", (self.width - (self.ui_width // 2), 30), colours.UI_TEXT_COLOUR, 50)
+                    clicked_node.state = State.BLANK
+                    clicked_node.cost = 1
 
         self.stop_button.update()
         for button in self.buttons:
@@ -261,4 +458,33 @@ class Visualisation:
             if not self.is_running:
                 button.update()
 
-            button.draw()
\ No newline at end of file
+        # take the next frame's worth of steps of the running algorithm
+        if self.running_algo is not None:
+            analysis = self.running_algo.update()
+            if analysis is not None:
+                print(analysis)
+                self.running_algo = None
+
+        self.dirty_rects = []
+
+        # the UI doesn't change between frames, so it is only drawn when the whole page is redrawn
+        if self.drawn_state is None:
+
+            self.surface.fill(colours.UI_BG_COLOUR)
+            self.dirty_rects.append(self.surface.get_rect())
+
+            basicUI.text(self.surface, "PATHFINDING", (self.width - (self.ui_width // 2), 30),
+                         colours.UI_TEXT_COLOUR, 50)
+
+            for button in self.buttons:
+                button.draw()
+
+        full_redraw = self.drawn_state is None
+        self.draw_grid()
+
+        # the comparison is drawn over the grid, so it is taken down as soon as any cell changes
+        if self.comparison is not None:
+            if full_redraw:
+                self.draw_comparison()
+            elif self.dirty_rects:
+                self.clear_comparison()
\ No newline at end of file